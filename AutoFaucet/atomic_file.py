@@ -0,0 +1,36 @@
+# -*- coding: utf-8 -*-
+"""
+原子写入模块
+先写临时文件并fsync，再重命名覆盖并同步目录项，写入中途崩溃不会留下半个文件。
+不依赖项目内其他模块（config在logger之前导入，不能使用utils）。
+"""
+
+import os
+
+def atomic_write_text(text: str, filepath: str):
+    """原子写入文本文件，失败时删除临时文件并抛出异常"""
+    tmp_path = f"{filepath}.tmp.{os.getpid()}"
+    try:
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write(text)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, filepath)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+
+    # 同步目录项，确保重命名本身落盘（不支持的平台忽略）
+    try:
+        dir_fd = os.open(os.path.dirname(os.path.abspath(filepath)), os.O_RDONLY)
+        try:
+            os.fsync(dir_fd)
+        finally:
+            os.close(dir_fd)
+    except OSError:
+        pass
+
+__all__ = ['atomic_write_text']
@@ -0,0 +1,410 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+性能基准测试脚本
+测量热点路径的吞吐量与单次调用延迟，并可与保存的基线对比发现性能回退
+"""
+
+import os
+import sys
+import json
+import time
+import queue
+import shutil
+import logging
+import logging.handlers
+import argparse
+import platform
+import tempfile
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
+
+# 添加当前目录到Python路径
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from logger import BatchingRotatingFileHandler, AsyncLogWriter, ChineseLogger
+from config import ConfigManager
+from utils import NetworkUtils, file_utils, time_utils
+
+# 默认基线文件：记录的是本机的绝对耗时，不纳入版本控制，在评审机器上对比较基准的代码生成
+BASELINE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'benchmark_baseline.json')
+
+# 默认回退阈值：比基线慢超过该比例即视为回退
+DEFAULT_THRESHOLD = 0.3
+
+# 已注册的基准测试
+BENCHMARKS: Dict[str, Callable[[int], List[Dict]]] = {}
+
+def benchmark(name: str):
+    """注册基准测试"""
+    def decorator(func):
+        BENCHMARKS[name] = func
+        return func
+    return decorator
+
+def percentile(samples: List[int], pct: float) -> float:
+    """计算百分位数"""
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, int(len(ordered) * pct / 100))
+    return float(ordered[index])
+
+def measure_calls(func: Callable[[int], None], count: int) -> Dict:
+    """逐次计时调用func，返回吞吐量与延迟分布（纳秒）"""
+    latencies = []
+    start = time.perf_counter_ns()
+    for i in range(count):
+        t0 = time.perf_counter_ns()
+        func(i)
+        latencies.append(time.perf_counter_ns() - t0)
+    total = time.perf_counter_ns() - start
+
+    return {
+        'calls_per_sec': count / (total / 1e9) if total else 0.0,
+        'p50_ns': percentile(latencies, 50),
+        'p99_ns': percentile(latencies, 99),
+        'total_sec': total / 1e9
+    }
+
+def measure_loop(func: Callable[[int], None], count: int, rounds: int = 5) -> Dict:
+    """整体计时调用func，适合测量亚微秒级的单次开销
+
+    调用分成rounds轮，取最快一轮的单次耗时，减少调度与频率波动的干扰。
+    """
+    per_round = max(1, count // rounds)
+    best = None
+    total = 0
+    for r in range(rounds):
+        start = time.perf_counter_ns()
+        for i in range(r * per_round, (r + 1) * per_round):
+            func(i)
+        elapsed = time.perf_counter_ns() - start
+        total += elapsed
+        best = elapsed if best is None else min(best, elapsed)
+
+    return {
+        'calls_per_sec': per_round / (best / 1e9) if best else 0.0,
+        'ns_per_call': best / per_round,
+        'total_sec': total / 1e9
+    }
+
+def _bench_logger(name: str) -> logging.Logger:
+    """创建独立的基准测试日志器"""
+    log = logging.getLogger(f"benchmark.{name}")
+    log.handlers.clear()
+    log.setLevel(logging.DEBUG)
+    log.propagate = False
+    return log
+
+@benchmark("logger_pipeline")
+def bench_logger_pipeline(count: int) -> List[Dict]:
+    """对比同步RotatingFileHandler与后台队列批量写入"""
+    formatter = logging.Formatter("%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+    results = []
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        # 同步写入：每条记录在调用线程上格式化、写盘并检查轮转
+        sync_log = _bench_logger("sync")
+        sync_handler = logging.handlers.RotatingFileHandler(
+            os.path.join(tmp_dir, "sync.log"), maxBytes=1024 * 1024,
+            backupCount=3, encoding='utf-8'
+        )
+        sync_handler.setFormatter(formatter)
+        sync_log.addHandler(sync_handler)
+
+        stats = measure_calls(lambda i: sync_log.info("ℹ️ 同步写入第 %d 条记录", i), count)
+        stats['name'] = "同步 RotatingFileHandler"
+        stats['drain_sec'] = 0.0
+        results.append(stats)
+        sync_handler.close()
+
+        # 异步写入：调用线程只入队，后台线程批量落盘
+        async_log = _bench_logger("async")
+        async_handler = BatchingRotatingFileHandler(
+            os.path.join(tmp_dir, "async.log"), maxBytes=1024 * 1024,
+            backupCount=3, encoding='utf-8'
+        )
+        async_handler.setFormatter(formatter)
+        log_queue = queue.SimpleQueue()
+        writer = AsyncLogWriter(log_queue, async_handler)
+        writer.start()
+        async_log.addHandler(logging.handlers.QueueHandler(log_queue))
+
+        stats = measure_calls(lambda i: async_log.info("ℹ️ 异步写入第 %d 条记录", i), count)
+        drain_start = time.perf_counter()
+        writer.stop(timeout=60)
+        stats['drain_sec'] = time.perf_counter() - drain_start
+        stats['name'] = "队列 + 后台批量写入"
+        results.append(stats)
+        async_handler.close()
+
+    return results
+
+class _FormattingHandler(logging.Handler):
+    """只格式化不输出的处理器，用于测量消息拼接的真实开销"""
+
+    def emit(self, record):
+        self.format(record)
+
+@benchmark("logger_helpers")
+def bench_logger_helpers(count: int) -> List[Dict]:
+    """测量中文日志辅助方法在级别开启与关闭时的单次开销"""
+    log = _bench_logger("helpers")
+    handler = _FormattingHandler()
+    handler.setFormatter(logging.Formatter("%(asctime)s - %(name)s - %(levelname)s - %(message)s"))
+    log.addHandler(handler)
+
+    # 跳过配置与处理器初始化，直接包装基准日志器
+    helper = ChineseLogger.__new__(ChineseLogger)
+    helper.logger = log
+
+    address = "0x742d35Cc6634C0532925a3b8D4C9db96C4b4d8b9"
+    cases = [
+        ("信息", lambda i: helper.信息("页面加载完成")),
+        ("等待", lambda i: helper.等待("随机延迟", 1.5)),
+        ("钱包", lambda i: helper.钱包("连接", address)),
+        ("输入", lambda i: helper.输入("地址输入框", address)),
+        ("反检测", lambda i: helper.反检测("设置视口", "1920x1080")),
+    ]
+
+    results = []
+    for level_name, level in (("DEBUG", logging.DEBUG), ("WARNING", logging.WARNING)):
+        log.setLevel(level)
+        for case_name, func in cases:
+            stats = measure_loop(func, count)
+            state = "开启" if log.isEnabledFor(logging.DEBUG if case_name == "反检测" else logging.INFO) else "关闭"
+            stats['name'] = f"{case_name} @{level_name}({state})"
+            results.append(stats)
+
+    return results
+
+@benchmark("config")
+def bench_config(count: int) -> List[Dict]:
+    """测量配置完整加载与各get_*读取的开销"""
+    results = []
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        config_path = os.path.join(tmp_dir, 'config.yaml')
+        shutil.copy(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'config.yaml'), config_path)
+        manager = ConfigManager(config_path)
+
+        # 完整加载需要解析YAML，次数减少到 1/10
+        stats = measure_calls(lambda i: manager.load_config(), max(1, count // 10))
+        stats['name'] = "load_config"
+        results.append(stats)
+
+        cases = [
+            ("get_browser_config", lambda i: manager.get_browser_config()),
+            ("get_faucet_config", lambda i: manager.get_faucet_config("0g_testnet")),
+            ("get_captcha_config", lambda i: manager.get_captcha_config()),
+            ("get_logging_config", lambda i: manager.get_logging_config()),
+        ]
+        for case_name, func in cases:
+            stats = measure_loop(func, count)
+            stats['name'] = case_name
+            results.append(stats)
+
+    return results
+
+@benchmark("success_records")
+def bench_success_records(count: int) -> List[Dict]:
+    """测量保存成功记录的单次开销随历史记录数的变化"""
+    from main import AutoFaucetBot
+
+    # 公网IP查询替换为固定值，只测量本地写入路径
+    original_get_public_ip = NetworkUtils.__dict__['get_public_ip']
+    NetworkUtils.get_public_ip = staticmethod(lambda: "203.0.113.7")
+
+    result = {
+        'success': True, 'tx_hash': '0x' + 'ab' * 32, 'amount': '0.1',
+        'wallet_address': '0x742d35Cc6634C0532925a3b8D4C9db96C4b4d8b9', 'network': '0G Testnet'
+    }
+    calls = max(1, count // 10)
+    results = []
+
+    try:
+        for history in (0, 10000, 100000):
+            with tempfile.TemporaryDirectory() as tmp_dir:
+                # 用旧格式JSON一次性导入历史记录
+                if history:
+                    file_utils.save_json([
+                        {'timestamp': f'2025-01-01T00:00:00.{i:06d}', 'tx_hash': f'0x{i:064x}'}
+                        for i in range(history)
+                    ], os.path.join(tmp_dir, 'success_records.json'), indent=None)
+
+                # 跳过信号注册与浏览器初始化，只保留记录存储需要的属性
+                bot = AutoFaucetBot.__new__(AutoFaucetBot)
+                bot.logs_dir = tmp_dir
+                bot.record_store = None
+                bot._get_record_store()
+
+                stats = measure_calls(lambda i: bot._save_success_record(result), calls)
+                stats['name'] = f"历史 {history} 条"
+                results.append(stats)
+                bot.record_store.close()
+    finally:
+        NetworkUtils.get_public_ip = original_get_public_ip
+
+    return results
+
+@benchmark("cleanup_old_files")
+def bench_cleanup_old_files(count: int, rounds: int = 3) -> List[Dict]:
+    """测量大目录下清理旧文件的单文件开销（先删除一半，再扫描剩余文件），取多轮最好成绩"""
+    old_time = time.time() - 48 * 3600
+    results = []
+
+    for files in (1000, 10000):
+        best: Dict[str, int] = {}
+        for _ in range(rounds):
+            with tempfile.TemporaryDirectory() as tmp_dir:
+                for i in range(files):
+                    path = os.path.join(tmp_dir, f"screenshot_{i:06d}.png")
+                    with open(path, 'wb'):
+                        pass
+                    if i % 2 == 0:
+                        os.utime(path, (old_time, old_time))
+
+                for action in ("删除一半", "仅扫描"):
+                    start = time.perf_counter_ns()
+                    file_utils.cleanup_old_files(tmp_dir, max_age_hours=24, pattern="*.png")
+                    total = time.perf_counter_ns() - start
+                    best[action] = min(best.get(action, total), total)
+
+        for action, total in best.items():
+            results.append({
+                'name': f"{files} 个文件({action})",
+                'calls_per_sec': files / (total / 1e9) if total else 0.0,
+                'ns_per_call': total / files,
+                'total_sec': total / 1e9
+            })
+
+    return results
+
+@benchmark("format_duration")
+def bench_format_duration(count: int) -> List[Dict]:
+    """测量时长格式化的单次开销"""
+    results = []
+    for case_name, seconds in (("秒", 12.5), ("分钟", 754.0), ("小时", 86400.0)):
+        stats = measure_loop(lambda i: time_utils.format_duration(seconds), count)
+        stats['name'] = f"format_duration({case_name})"
+        results.append(stats)
+    return results
+
+# 结果表格的列：(字段, 标题, 换算系数, 格式)
+COLUMNS = [
+    ('calls_per_sec', '调用/秒', 1, '.0f'),
+    ('ns_per_call', 'ns/次', 1, '.1f'),
+    ('p50_ns', 'p50(μs)', 1e-3, '.2f'),
+    ('p99_ns', 'p99(μs)', 1e-3, '.2f'),
+    ('drain_sec', '落盘(秒)', 1, '.3f'),
+]
+
+def print_results(title: str, results: List[Dict]):
+    """打印结果表格，只显示结果中出现的列"""
+    columns = [col for col in COLUMNS if any(col[0] in item for item in results)]
+
+    print(f"\n== {title} ==")
+    print(f"{'场景':<28}" + "".join(f"{label:>14}" for _, label, _, _ in columns))
+    for item in results:
+        cells = "".join(
+            f"{item[key] * scale:>14{fmt}}" if key in item else f"{'-':>14}"
+            for key, _, scale, fmt in columns
+        )
+        print(f"{item['name']:<28}{cells}")
+
+def result_metric(item: Dict) -> Optional[float]:
+    """取用于基线对比的单次耗时（纳秒）"""
+    for key in ('ns_per_call', 'p50_ns'):
+        if key in item:
+            return float(item[key])
+    return None
+
+def machine_info() -> Dict[str, str]:
+    """生成基线的机器与解释器，不同机器的绝对耗时不可比"""
+    return {
+        'host': platform.node(),
+        'platform': platform.platform(),
+        'python': platform.python_version(),
+    }
+
+def save_baseline(path: str, all_results: Dict[str, List[Dict]], count: int):
+    """保存基线：每个场景的单次耗时"""
+    baseline = file_utils.load_json(path) if os.path.exists(path) else None
+    if not isinstance(baseline, dict):
+        baseline = {}
+
+    benchmarks = baseline.setdefault('benchmarks', {})
+    for name, results in all_results.items():
+        benchmarks[name] = {item['name']: round(result_metric(item), 1) for item in results}
+    baseline['count'] = count
+    baseline['machine'] = machine_info()
+    baseline['updated_at'] = datetime.now().isoformat(timespec='seconds')
+
+    file_utils.atomic_write_text(json.dumps(baseline, ensure_ascii=False, indent=2, sort_keys=True) + "\n", path)
+    print(f"\n基线已保存: {path}")
+
+def check_baseline(path: str, all_results: Dict[str, List[Dict]], count: int, threshold: float) -> bool:
+    """与基线对比，任一场景比基线慢超过阈值即返回False"""
+    baseline = file_utils.load_json(path)
+    if not isinstance(baseline, dict):
+        print(f"\n基线文件不存在或无法读取: {path}")
+        print("请先在本机检出对比的基准版本并运行 python benchmark.py --save-baseline")
+        return False
+    if baseline.get('machine') != machine_info():
+        print(f"\n⚠️ 基线生成于其他机器或解释器 ({baseline.get('machine')})，绝对耗时不可比，请在本机重新生成")
+    if baseline.get('count') != count:
+        print(f"\n⚠️ 基线按 --count {baseline.get('count')} 生成，本次为 {count}，结果可能不可比")
+
+    regressions = []
+    print(f"\n== 基线对比 (阈值 +{threshold:.0%}) ==")
+    for name, results in all_results.items():
+        expected = baseline.get('benchmarks', {}).get(name, {})
+        for item in results:
+            reference = expected.get(item['name'])
+            current = result_metric(item)
+            if not reference or current is None:
+                print(f"  {name}/{item['name']}: 无基线")
+                continue
+
+            change = current / reference - 1
+            mark = "❌" if change > threshold else "✅"
+            print(f"  {mark} {name}/{item['name']}: {reference:.1f} -> {current:.1f} ns ({change:+.0%})")
+            if change > threshold:
+                regressions.append(f"{name}/{item['name']}")
+
+    if regressions:
+        print(f"\n性能回退 {len(regressions)} 项: {', '.join(regressions)}")
+        return False
+    print("\n未发现性能回退")
+    return True
+
+def main():
+    """主函数"""
+    parser = argparse.ArgumentParser(description='AutoFaucet性能基准测试')
+    parser.add_argument('names', nargs='*', help=f"要运行的基准测试（可选: {', '.join(BENCHMARKS)}）")
+    parser.add_argument('--count', '-n', type=int, default=50000, help='每个场景的调用次数')
+    parser.add_argument('--baseline', default=BASELINE_FILE, help='基线文件路径')
+    parser.add_argument('--save-baseline', action='store_true', help='将本次结果保存为基线')
+    parser.add_argument('--check', action='store_true', help='与基线对比，出现回退时以非零状态退出')
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help=f'回退阈值，比基线慢超过该比例视为回退（默认 {DEFAULT_THRESHOLD}）')
+    args = parser.parse_args()
+
+    names = args.names or list(BENCHMARKS)
+    for name in names:
+        if name not in BENCHMARKS:
+            parser.error(f"未知的基准测试: {name}")
+
+    all_results = {}
+    for name in names:
+        all_results[name] = BENCHMARKS[name](args.count)
+        print_results(name, all_results[name])
+
+    if args.save_baseline:
+        save_baseline(args.baseline, all_results, args.count)
+    if args.check and not check_baseline(args.baseline, all_results, args.count, args.threshold):
+        sys.exit(1)
+
+if __name__ == '__main__':
+    main()
@@ -14,12 +14,6 @@ from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.common.action_chains import ActionChains
 from selenium.common.exceptions import TimeoutException, NoSuchElementException
-import undetected_chromedriver as uc
-from selenium import webdriver
-from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.chrome.options import Options as ChromeOptions
-from webdriver_manager.chrome import ChromeDriverManager
-from fake_useragent import UserAgent
 from config import config_manager
 from logger import logger
 
@@ -31,6 +25,9 @@ class BrowserManager:
         self.wait = None
         self.config = config_manager.get_browser_config()
         self.proxy_config = config_manager.get_proxy_config()
+        
+        # 重量级依赖在首次创建浏览器管理器时才导入，保持命令行冷启动轻量
+        from fake_useragent import UserAgent
         self.ua = UserAgent()
         
         # 反检测配置
@@ -54,6 +51,7 @@ class BrowserManager:
             
             # 首先尝试使用undetected-chromedriver
             try:
+                import undetected_chromedriver as uc
                 self.driver = uc.Chrome(
                     options=options,
                     version_main=None,  # 自动检测Chrome版本
@@ -69,6 +67,11 @@ class BrowserManager:
                 logger.反检测("回退到标准selenium webdriver")
                 
                 # 回退到标准selenium webdriver
+                from selenium import webdriver
+                from selenium.webdriver.chrome.service import Service
+                from selenium.webdriver.chrome.options import Options as ChromeOptions
+                from webdriver_manager.chrome import ChromeDriverManager
+                
                 # 转换选项格式
                 standard_options = ChromeOptions()
                 for arg in options.arguments:
@@ -100,8 +103,9 @@ class BrowserManager:
             logger.错误(f"启动浏览器失败: {str(e)}")
             return False
     
-    def _get_chrome_options(self, headless: bool, proxy: Optional[str]) -> uc.ChromeOptions:
+    def _get_chrome_options(self, headless: bool, proxy: Optional[str]) -> 'uc.ChromeOptions':
         """获取Chrome选项配置"""
+        import undetected_chromedriver as uc
         options = uc.ChromeOptions()
         
         # 基础反检测选项
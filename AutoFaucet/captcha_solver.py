@@ -8,12 +8,9 @@ import os
 import time
 import base64
 import requests
-import cv2
-import numpy as np
 from PIL import Image, ImageEnhance, ImageFilter
 from io import BytesIO
 from typing import Optional, Dict, Any, Tuple
-import pytesseract
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
@@ -36,6 +33,9 @@ class CaptchaSolver:
     def _init_ocr(self):
         """初始化OCR引擎"""
         try:
+            # OCR依赖在首次创建识别器时才导入
+            import pytesseract
+            
             # 检查tesseract是否可用
             pytesseract.get_tesseract_version()
             self.ocr_available = True
@@ -154,6 +154,9 @@ class CaptchaSolver:
         try:
             logger.验证码("开始图片预处理")
             
+            import cv2
+            import numpy as np
+            
             # 读取图片
             image = cv2.imread(image_path)
             if image is None:
@@ -199,6 +202,8 @@ class CaptchaSolver:
             # 配置OCR参数
             custom_config = r'--oem 3 --psm 8 -c tessedit_char_whitelist=0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz'
             
+            import pytesseract
+            
             # 识别文本
             text = pytesseract.image_to_string(
                 Image.open(image_path),
@@ -453,14 +458,17 @@ class CaptchaSolver:
     def cleanup_temp_files(self):
         """清理临时文件"""
         try:
-            import glob
-            temp_files = glob.glob(os.path.join(self.temp_dir, "captcha_*"))
-            for file in temp_files:
-                try:
-                    os.remove(file)
-                except:
-                    pass
-            logger.信息(f"清理临时文件: {len(temp_files)}个")
+            removed = 0
+            with os.scandir(self.temp_dir) as entries:
+                for entry in entries:
+                    if not entry.name.startswith("captcha_"):
+                        continue
+                    try:
+                        os.remove(entry.path)
+                        removed += 1
+                    except OSError:
+                        pass
+            logger.信息(f"清理临时文件: {removed}个")
         except Exception as e:
             logger.警告(f"清理临时文件失败: {str(e)}")
 
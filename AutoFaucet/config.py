@@ -6,10 +6,20 @@
 
 import yaml
 import os
+import copy
+import time
+import hashlib
 import logging
-from typing import Dict, List, Optional, Any
-from dataclasses import dataclass, asdict
+import threading
+from contextlib import contextmanager
+from types import MappingProxyType
+from typing import Dict, List, Optional, Any, Mapping, Iterator
+from dataclasses import dataclass, asdict, replace
 import json
+from atomic_file import atomic_write_text
+
+# 优先使用libyaml的C实现解析配置，缺失时回退到纯Python实现
+_YamlLoader = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
 
 @dataclass
 class Config:
@@ -19,7 +29,7 @@ class Config:
     captcha: 'CaptchaConfig'
     proxy: 'ProxyConfig'
 
-@dataclass
+@dataclass(frozen=True)
 class FaucetConfig:
     """Faucet网站配置"""
     name: str = "0G Testnet Faucet"
@@ -36,14 +46,14 @@ class FaucetConfig:
     requires_wallet: bool = True
     requires_twitter: bool = False
     captcha_type: str = "image"  # image, recaptcha, hcaptcha, slider
-    cooldown_hours: int = 24
+    cooldown_hours: float = 24
     selectors: Dict[str, str] = None
     
     def __post_init__(self):
         if self.selectors is None:
-            self.selectors = {}
+            object.__setattr__(self, 'selectors', {})
 
-@dataclass
+@dataclass(frozen=True)
 class BrowserConfig:
     """浏览器配置"""
     headless: bool = False
@@ -54,7 +64,7 @@ class BrowserConfig:
     page_load_timeout: int = 30
     implicit_wait: int = 10
     
-@dataclass
+@dataclass(frozen=True)
 class ProxyConfig:
     """代理配置"""
     enabled: bool = False
@@ -64,7 +74,7 @@ class ProxyConfig:
     username: str = ""
     password: str = ""
     
-@dataclass
+@dataclass(frozen=True)
 class CaptchaConfig:
     """验证码配置"""
     use_paid_service: bool = False
@@ -73,14 +83,136 @@ class CaptchaConfig:
     max_retry: int = 3
     timeout: int = 120
 
+class ConfigError(ValueError):
+    """配置值类型无效"""
+
+class _FieldReader:
+    """按字段读取并校验配置值：null按默认值处理，无法转换的字段记录错误（含字段路径）并使用默认值"""
+    
+    _TRUE = ('true', 'yes', 'on', '1')
+    _FALSE = ('false', 'no', 'off', '0')
+    
+    def __init__(self):
+        self.errors: List[str] = []
+    
+    def _fail(self, path: str, expected: str, value: Any, default: Any) -> Any:
+        self.errors.append(f"{path} 应为{expected}，实际为 {value!r}")
+        return default
+    
+    def section(self, config: Mapping, path: str) -> Mapping:
+        """读取配置段，不是映射时视为空"""
+        value = config.get(path)
+        if value is None:
+            return {}
+        if isinstance(value, dict):
+            return value
+        return self._fail(path, "映射", value, {})
+    
+    def text(self, data: Mapping, path: str, key: str, default: str = "") -> str:
+        value = data.get(key)
+        if value is None:
+            return default
+        if isinstance(value, (str, int, float)) and not isinstance(value, bool):
+            return str(value)
+        return self._fail(f"{path}.{key}", "字符串", value, default)
+    
+    def integer(self, data: Mapping, path: str, key: str, default: int) -> int:
+        value = data.get(key)
+        if value is None:
+            return default
+        if isinstance(value, int) and not isinstance(value, bool):
+            return value
+        if isinstance(value, float) and value.is_integer():
+            return int(value)
+        if isinstance(value, str):
+            try:
+                return int(value.strip())
+            except ValueError:
+                pass
+        return self._fail(f"{path}.{key}", "整数", value, default)
+    
+    def number(self, data: Mapping, path: str, key: str, default: float) -> float:
+        value = data.get(key)
+        if value is None:
+            return default
+        if isinstance(value, (int, float)) and not isinstance(value, bool):
+            return value
+        if isinstance(value, str):
+            try:
+                return float(value.strip())
+            except ValueError:
+                pass
+        return self._fail(f"{path}.{key}", "数字", value, default)
+    
+    def flag(self, data: Mapping, path: str, key: str, default: bool) -> bool:
+        value = data.get(key)
+        if value is None:
+            return default
+        if isinstance(value, bool):
+            return value
+        normalized = str(value).strip().lower()
+        if normalized in self._TRUE:
+            return True
+        if normalized in self._FALSE:
+            return False
+        return self._fail(f"{path}.{key}", "布尔值", value, default)
+    
+    def size(self, data: Mapping, path: str, key: str, default: tuple) -> tuple:
+        value = data.get(key)
+        if value is None:
+            return default
+        if isinstance(value, (list, tuple)) and len(value) == 2:
+            items = {'width': value[0], 'height': value[1]}
+            width = self.integer(items, f"{path}.{key}", 'width', None)
+            height = self.integer(items, f"{path}.{key}", 'height', None)
+            if width is not None and height is not None:
+                return (width, height)
+            return default
+        return self._fail(f"{path}.{key}", "[宽, 高]", value, default)
+    
+    def mapping(self, data: Mapping, path: str, key: str) -> Dict:
+        value = data.get(key)
+        if value is None:
+            return {}
+        if isinstance(value, dict):
+            return dict(value)
+        return self._fail(f"{path}.{key}", "映射", value, {})
+
+@dataclass(frozen=True)
+class ConfigSnapshot:
+    """配置快照 - 解析校验一次后缓存，各模块只读共享"""
+    browser: BrowserConfig
+    proxy: ProxyConfig
+    captcha: CaptchaConfig
+    faucets: Mapping[str, FaucetConfig]
+    anti_detection: Mapping[str, Any]
+    logging: Mapping[str, Any]
+    maintenance: Mapping[str, Any]
+    diagnostics: Mapping[str, Any]
+    digest: str = ""
+
 class ConfigManager:
     """配置管理器"""
     
-    def __init__(self, config_file: str = "config.yaml"):
+    def __init__(self, config_file: str = "config.yaml", reload_interval: float = 1.0):
         self.config_file = config_file
         self.config_dir = os.path.dirname(os.path.abspath(__file__))
         self.config_path = os.path.join(self.config_dir, config_file)
         
+        # 热加载：最多每 reload_interval 秒检查一次文件，mtime/大小或内容哈希变化才重新解析
+        self.reload_interval = reload_interval
+        self._snapshot: Optional[ConfigSnapshot] = None
+        self._file_state = None
+        self._digest = ""
+        self._last_check = 0.0
+        self._lock = threading.RLock()
+        
+        # 批量更新状态（每个线程独立：嵌套层数与暂存的修改）
+        self._batch = threading.local()
+        
+        # 最近一次加载时发现的配置问题
+        self.load_errors: List[str] = []
+        
         # 默认配置
         self.default_config = {
             "browser": {
@@ -141,123 +273,321 @@ class ConfigManager:
                 "file_enabled": True,
                 "console_enabled": True,
                 "max_file_size": "10MB",
-                "backup_count": 5
+                "backup_count": 5,
+                "file_level": "DEBUG",
+                "async_enabled": True,
+                "flush_interval": 1.0,
+                "flush_batch_size": 256,
+                "max_queue_size": 10000
+            },
+            "maintenance": {
+                "enabled": True,
+                "interval_minutes": 60,
+                "compress_logs": True,
+                "log_max_age_days": 30,
+                "log_max_total_mb": 500,
+                "log_min_idle_minutes": 60,
+                "screenshot_max_age_days": 7,
+                "screenshot_max_total_mb": 200,
+                "temp_captcha_max_age_hours": 24
+            },
+            "diagnostics": {
+                "enabled": True,
+                "top_n": 20,
+                "profile_seconds": 0
             }
         }
         
         self.load_config()
     
     def load_config(self) -> Dict:
-        """加载配置文件"""
-        if os.path.exists(self.config_path):
-            try:
-                with open(self.config_path, 'r', encoding='utf-8') as f:
-                    loaded_config = yaml.safe_load(f)
-                    # 合并默认配置和加载的配置
-                    self.config = self._merge_config(self.default_config, loaded_config)
-            except Exception as e:
-                print(f"加载配置文件失败: {e}，使用默认配置")
-                self.config = self.default_config.copy()
-        else:
-            print("配置文件不存在，创建默认配置文件")
-            self.config = self.default_config.copy()
-            self.save_config()
+        """加载配置文件
+        
+        单个字段无效时只有该字段使用默认值，其余配置照常生效；
+        所有问题记录在 load_errors 中，由调用方决定是否继续运行。
+        """
+        with self._lock:
+            self.load_errors = []
+            if os.path.exists(self.config_path):
+                try:
+                    self._load_file(self.load_errors)
+                except Exception as e:
+                    # 文件无法读取或解析，没有可用的用户配置
+                    self.load_errors.append(f"加载配置文件失败: {e}")
+                    self.config = copy.deepcopy(self.default_config)
+                    self._snapshot = self._build_snapshot(self.config)
+                for error in self.load_errors:
+                    print(f"配置错误: {error}")
+            else:
+                print("配置文件不存在，创建默认配置文件")
+                self.config = copy.deepcopy(self.default_config)
+                self._snapshot = self._build_snapshot(self.config)
+                self.save_config()
+            
+            self._last_check = time.monotonic()
         
         return self.config
     
+    def _load_file(self, errors: Optional[List[str]] = None):
+        """读取并解析配置文件，生成新的快照（errors的含义见_build_snapshot）"""
+        stat = os.stat(self.config_path)
+        with open(self.config_path, 'rb') as f:
+            raw = f.read()
+        
+        loaded_config = yaml.load(raw.decode('utf-8'), Loader=_YamlLoader) or {}
+        # 合并默认配置和加载的配置
+        config = self._merge_config(self.default_config, loaded_config)
+        # 先构建快照，校验失败时保留原有配置
+        snapshot = self._build_snapshot(config, hashlib.sha256(raw).hexdigest(), errors)
+        
+        self.config = config
+        self._snapshot = snapshot
+        self._digest = snapshot.digest
+        self._file_state = (stat.st_mtime_ns, stat.st_size)
+    
+    def _reload_if_changed(self):
+        """配置文件有变化时重新加载"""
+        try:
+            stat = os.stat(self.config_path)
+        except OSError:
+            return
+        
+        if (stat.st_mtime_ns, stat.st_size) == self._file_state:
+            return
+        
+        try:
+            with open(self.config_path, 'rb') as f:
+                digest = hashlib.sha256(f.read()).hexdigest()
+            
+            # 仅修改时间变化而内容相同，不必重新解析
+            if digest == self._digest:
+                self._file_state = (stat.st_mtime_ns, stat.st_size)
+                return
+            
+            self._load_file()
+            print(f"检测到配置文件变更，已重新加载: {self.config_path}")
+        except Exception as e:
+            # 记录此次状态，避免对同一份错误文件反复解析
+            self._file_state = (stat.st_mtime_ns, stat.st_size)
+            print(f"重新加载配置文件失败: {e}，继续使用当前配置")
+    
+    def snapshot(self) -> ConfigSnapshot:
+        """获取当前配置快照"""
+        now = time.monotonic()
+        if now - self._last_check >= self.reload_interval:
+            with self._lock:
+                if now - self._last_check >= self.reload_interval:
+                    self._last_check = now
+                    self._reload_if_changed()
+        return self._snapshot
+    
     def save_config(self) -> bool:
-        """保存配置文件"""
+        """保存配置文件（原子写入，内容未变化时跳过）"""
         try:
-            with open(self.config_path, 'w', encoding='utf-8') as f:
-                yaml.dump(self.config, f, default_flow_style=False, allow_unicode=True)
+            with self._lock:
+                data = yaml.dump(self.config, default_flow_style=False, allow_unicode=True)
+                digest = hashlib.sha256(data.encode('utf-8')).hexdigest()
+                if digest == self._digest and os.path.exists(self.config_path):
+                    return True
+                
+                atomic_write_text(data, self.config_path)
+                
+                # 记录自身写入的文件状态，避免被当作外部修改重新加载
+                stat = os.stat(self.config_path)
+                self._digest = digest
+                self._file_state = (stat.st_mtime_ns, stat.st_size)
+                if self._snapshot is not None:
+                    self._snapshot = replace(self._snapshot, digest=self._digest)
             return True
         except Exception as e:
             print(f"保存配置文件失败: {e}")
             return False
     
     def _merge_config(self, default: Dict, loaded: Dict) -> Dict:
-        """合并配置"""
-        result = default.copy()
+        """合并配置（返回新字典，不修改默认配置）"""
+        result = copy.deepcopy(default)
         for key, value in loaded.items():
             if key in result and isinstance(result[key], dict) and isinstance(value, dict):
                 result[key] = self._merge_config(result[key], value)
             else:
-                result[key] = value
+                result[key] = copy.deepcopy(value)
         return result
     
+    def _build_snapshot(self, config: Dict, digest: str = "",
+                        errors: Optional[List[str]] = None) -> ConfigSnapshot:
+        """将配置字典解析为类型化的只读快照
+        
+        errors为None时任一字段无效即抛出ConfigError；否则无效字段使用默认值，错误追加到errors中。
+        """
+        reader = _FieldReader()
+        browser_config = reader.section(config, "browser")
+        proxy_config = reader.section(config, "proxy")
+        captcha_config = reader.section(config, "captcha")
+        
+        faucets = {}
+        for faucet_name, faucet_data in reader.section(config, "faucets").items():
+            path = f"faucets.{faucet_name}"
+            if not isinstance(faucet_data, dict):
+                reader.errors.append(f"{path} 应为映射，实际为 {faucet_data!r}")
+                continue
+            faucets[faucet_name] = FaucetConfig(
+                name=reader.text(faucet_data, path, "name"),
+                url=reader.text(faucet_data, path, "url"),
+                network=reader.text(faucet_data, path, "network"),
+                requires_wallet=reader.flag(faucet_data, path, "requires_wallet", True),
+                requires_twitter=reader.flag(faucet_data, path, "requires_twitter", False),
+                captcha_type=reader.text(faucet_data, path, "captcha_type", "image"),
+                cooldown_hours=reader.number(faucet_data, path, "cooldown_hours", 24),
+                selectors=reader.mapping(faucet_data, path, "selectors")
+            )
+        
+        snapshot = ConfigSnapshot(
+            browser=BrowserConfig(
+                headless=reader.flag(browser_config, "browser", "headless", False),
+                window_size=reader.size(browser_config, "browser", "window_size", (1920, 1080)),
+                user_agent=reader.text(browser_config, "browser", "user_agent"),
+                disable_images=reader.flag(browser_config, "browser", "disable_images", True),
+                disable_javascript=reader.flag(browser_config, "browser", "disable_javascript", False),
+                page_load_timeout=reader.integer(browser_config, "browser", "page_load_timeout", 30),
+                implicit_wait=reader.integer(browser_config, "browser", "implicit_wait", 10)
+            ),
+            proxy=ProxyConfig(
+                enabled=reader.flag(proxy_config, "proxy", "enabled", False),
+                proxy_type=reader.text(proxy_config, "proxy", "proxy_type", "http"),
+                host=reader.text(proxy_config, "proxy", "host"),
+                port=reader.integer(proxy_config, "proxy", "port", 0),
+                username=reader.text(proxy_config, "proxy", "username"),
+                password=reader.text(proxy_config, "proxy", "password")
+            ),
+            captcha=CaptchaConfig(
+                use_paid_service=reader.flag(captcha_config, "captcha", "use_paid_service", False),
+                api_key=reader.text(captcha_config, "captcha", "api_key"),
+                service_provider=reader.text(captcha_config, "captcha", "service_provider", "2captcha"),
+                max_retry=reader.integer(captcha_config, "captcha", "max_retry", 3),
+                timeout=reader.integer(captcha_config, "captcha", "timeout", 120)
+            ),
+            faucets=MappingProxyType(faucets),
+            anti_detection=MappingProxyType(copy.deepcopy(reader.section(config, "anti_detection"))),
+            logging=MappingProxyType(copy.deepcopy(reader.section(config, "logging"))),
+            maintenance=MappingProxyType(copy.deepcopy(reader.section(config, "maintenance"))),
+            diagnostics=MappingProxyType(copy.deepcopy(reader.section(config, "diagnostics"))),
+            digest=digest
+        )
+        
+        if reader.errors:
+            if errors is None:
+                raise ConfigError("配置校验失败: " + "; ".join(reader.errors))
+            errors.extend(reader.errors)
+        return snapshot
+    
     def get_browser_config(self) -> BrowserConfig:
         """获取浏览器配置"""
-        browser_config = self.config.get("browser", {})
-        return BrowserConfig(
-            headless=browser_config.get("headless", False),
-            window_size=tuple(browser_config.get("window_size", [1920, 1080])),
-            user_agent=browser_config.get("user_agent", ""),
-            disable_images=browser_config.get("disable_images", True),
-            disable_javascript=browser_config.get("disable_javascript", False),
-            page_load_timeout=browser_config.get("page_load_timeout", 30),
-            implicit_wait=browser_config.get("implicit_wait", 10)
-        )
+        return self.snapshot().browser
     
     def get_proxy_config(self) -> ProxyConfig:
         """获取代理配置"""
-        proxy_config = self.config.get("proxy", {})
-        return ProxyConfig(
-            enabled=proxy_config.get("enabled", False),
-            proxy_type=proxy_config.get("proxy_type", "http"),
-            host=proxy_config.get("host", ""),
-            port=proxy_config.get("port", 0),
-            username=proxy_config.get("username", ""),
-            password=proxy_config.get("password", "")
-        )
+        return self.snapshot().proxy
     
     def get_captcha_config(self) -> CaptchaConfig:
         """获取验证码配置"""
-        captcha_config = self.config.get("captcha", {})
-        return CaptchaConfig(
-            use_paid_service=captcha_config.get("use_paid_service", False),
-            api_key=captcha_config.get("api_key", ""),
-            service_provider=captcha_config.get("service_provider", "2captcha"),
-            max_retry=captcha_config.get("max_retry", 3),
-            timeout=captcha_config.get("timeout", 120)
-        )
+        return self.snapshot().captcha
     
     def get_faucet_config(self, faucet_name: str) -> Optional[FaucetConfig]:
         """获取指定faucet配置"""
-        faucets = self.config.get("faucets", {})
-        if faucet_name not in faucets:
-            return None
-        
-        faucet_data = faucets[faucet_name]
-        return FaucetConfig(
-            name=faucet_data.get("name", ""),
-            url=faucet_data.get("url", ""),
-            network=faucet_data.get("network", ""),
-            requires_wallet=faucet_data.get("requires_wallet", True),
-            requires_twitter=faucet_data.get("requires_twitter", False),
-            captcha_type=faucet_data.get("captcha_type", "image"),
-            cooldown_hours=faucet_data.get("cooldown_hours", 24),
-            selectors=faucet_data.get("selectors", {})
-        )
+        return self.snapshot().faucets.get(faucet_name)
     
     def get_all_faucets(self) -> List[str]:
         """获取所有faucet名称"""
-        return list(self.config.get("faucets", {}).keys())
+        return list(self.snapshot().faucets.keys())
     
-    def get_anti_detection_config(self) -> Dict:
+    def get_anti_detection_config(self) -> Mapping[str, Any]:
         """获取反检测配置"""
-        return self.config.get("anti_detection", {})
+        return self.snapshot().anti_detection
     
-    def get_logging_config(self) -> Dict:
+    def get_logging_config(self) -> Mapping[str, Any]:
         """获取日志配置"""
-        return self.config.get("logging", {})
+        return self.snapshot().logging
+    
+    def get_maintenance_config(self) -> Mapping[str, Any]:
+        """获取后台清理配置"""
+        return self.snapshot().maintenance
+    
+    def get_diagnostics_config(self) -> Mapping[str, Any]:
+        """获取运行诊断配置"""
+        return self.snapshot().diagnostics
+    
+    @contextmanager
+    def batch_update(self) -> Iterator['ConfigManager']:
+        """批量更新配置：块内的修改先暂存，退出时一次性校验、应用并写入
+        
+        可以嵌套，由最外层负责提交。暂存期间不持有锁，其他线程读取配置不受影响；
+        块内读取到的仍是修改前的配置。块内发生异常或有修改未通过校验时全部丢弃。
+        """
+        batch = self._batch
+        if getattr(batch, 'depth', 0) == 0:
+            batch.pending = []
+            batch.rejected = False
+        batch.depth = getattr(batch, 'depth', 0) + 1
+        
+        try:
+            yield self
+        except BaseException:
+            batch.depth -= 1
+            if batch.depth == 0:
+                batch.pending = []
+            raise
+        
+        batch.depth -= 1
+        if batch.depth == 0 and batch.pending:
+            pending, batch.pending = batch.pending, []
+            if batch.rejected:
+                print(f"批量更新中有配置未通过校验，已丢弃全部 {len(pending)} 项修改")
+            else:
+                self._apply(pending)
+    
+    def _set_value(self, section: str, key: str, value: Any) -> bool:
+        """设置配置项：批量更新中校验后暂存，否则立即应用并保存"""
+        change = (section, key, copy.deepcopy(value))
+        batch = self._batch
+        if getattr(batch, 'depth', 0) == 0:
+            return self._apply([change])
+        
+        try:
+            with self._lock:
+                candidate = self._with_changes(batch.pending + [change])
+            self._build_snapshot(candidate)
+        except ConfigError as e:
+            batch.rejected = True
+            print(f"配置修改未生效: {e}")
+            return False
+        batch.pending.append(change)
+        return True
+    
+    def _with_changes(self, changes: List[tuple]) -> Dict[str, Any]:
+        """返回应用了修改的配置副本（调用方持有锁）"""
+        candidate = copy.deepcopy(self.config)
+        for section, key, value in changes:
+            candidate.setdefault(section, {})[key] = value
+        return candidate
+    
+    def _apply(self, changes: List[tuple]) -> bool:
+        """在配置副本上应用修改并校验，通过后才替换当前配置与快照并保存；未通过时保持不变"""
+        with self._lock:
+            candidate = self._with_changes(changes)
+            try:
+                snapshot = self._build_snapshot(candidate)
+            except ConfigError as e:
+                print(f"配置修改未生效: {e}")
+                return False
+            
+            self.config = candidate
+            self._snapshot = snapshot
+            return self.save_config()
     
     def update_config(self, section: str, key: str, value) -> bool:
         """更新配置"""
         try:
-            if section not in self.config:
-                self.config[section] = {}
-            self.config[section][key] = value
-            return self.save_config()
+            return self._set_value(section, key, value)
         except Exception as e:
             print(f"更新配置失败: {e}")
             return False
@@ -265,10 +595,7 @@ class ConfigManager:
     def add_faucet(self, faucet_name: str, faucet_config: FaucetConfig) -> bool:
         """添加新的faucet配置"""
         try:
-            if "faucets" not in self.config:
-                self.config["faucets"] = {}
-            self.config["faucets"][faucet_name] = asdict(faucet_config)
-            return self.save_config()
+            return self._set_value("faucets", faucet_name, asdict(faucet_config))
         except Exception as e:
             print(f"添加faucet配置失败: {e}")
             return False
@@ -0,0 +1,244 @@
+# -*- coding: utf-8 -*-
+"""
+运行诊断模块
+收到 SIGUSR1 时导出所有线程的调用栈、内存分配变化，并可按时长采样一次性能分析；
+收到 SIGUSR2 时关闭内存分配跟踪
+"""
+
+import os
+import sys
+import time
+import signal
+import threading
+import traceback
+from collections import Counter
+from datetime import datetime
+from typing import Dict, List, Optional
+from logger import logger
+from utils import file_utils
+
+# 信号处理器写入管道的命令字节
+_DUMP = b'd'
+_TRACE_OFF = b'o'
+_QUIT = b'q'
+
+class DiagnosticsHandler:
+    """信号触发的诊断 - 信号处理器只向管道写一个字节，采集与写文件都在后台线程完成。
+
+    信号可能打断正持有日志或其他锁的主线程，处理器中不记录日志、不创建线程。
+    内存分配跟踪在首次触发后开启并一直保持（有一定内存与性能开销），
+    直到收到关闭信号或调用stop()。
+    """
+
+    def __init__(self, output_dir: str, top_n: int = 20, profile_seconds: float = 0,
+                 sample_interval: float = 0.01):
+        self.output_dir = output_dir
+        self.top_n = top_n
+        self.profile_seconds = profile_seconds
+        self.sample_interval = sample_interval
+        self._snapshot = None  # 上次的内存快照，首次触发后才开启tracemalloc
+        self._started_tracing = False
+        self._read_fd: Optional[int] = None
+        self._write_fd: Optional[int] = None
+        self._thread: Optional[threading.Thread] = None
+        self._previous_handlers: Dict[int, object] = {}
+        self._stop_event = threading.Event()
+        self._lock = threading.Lock()  # 只在信号处理器之外使用
+
+    def install(self, signum: Optional[int] = None, off_signum: Optional[int] = None) -> bool:
+        """注册诊断与关闭跟踪的信号处理器并启动后台线程，不支持的平台（Windows）返回False"""
+        signum = signum if signum is not None else getattr(signal, 'SIGUSR1', None)
+        off_signum = off_signum if off_signum is not None else getattr(signal, 'SIGUSR2', None)
+        if signum is None:
+            return False
+
+        if self._thread is None:
+            self._read_fd, self._write_fd = os.pipe()
+            os.set_blocking(self._write_fd, False)
+            self._stop_event.clear()
+            self._thread = threading.Thread(target=self._run, name="Diagnostics", daemon=True)
+            self._thread.start()
+
+        self._previous_handlers[signum] = signal.signal(signum, self._signal_handler)
+        if off_signum is not None:
+            self._previous_handlers[off_signum] = signal.signal(off_signum, self._trace_off_handler)
+        return True
+
+    def _signal_handler(self, signum, frame):
+        """信号处理器：通知后台线程导出诊断信息"""
+        self._notify(_DUMP)
+
+    def _trace_off_handler(self, signum, frame):
+        """信号处理器：通知后台线程关闭内存分配跟踪"""
+        self._notify(_TRACE_OFF)
+
+    def _notify(self, command: bytes):
+        """向管道写入命令；管道已满或已关闭时忽略"""
+        try:
+            os.write(self._write_fd, command)
+        except (OSError, TypeError):
+            pass
+
+    def _run(self):
+        """后台线程主循环：阻塞在管道上，不触发时不占用CPU"""
+        while not self._stop_event.is_set():
+            try:
+                commands = os.read(self._read_fd, 64)
+            except OSError:
+                break
+            if not commands or _QUIT in commands:
+                break
+
+            try:
+                if _TRACE_OFF in commands:
+                    self.stop_tracing()
+                if _DUMP in commands:
+                    self.dump()
+            except Exception as e:
+                logger.错误(f"导出诊断信息失败: {str(e)}")
+
+    def dump(self):
+        """导出调用栈与内存分配报告，配置了采样时长时再做一次性能采样"""
+        stamp = datetime.now().strftime('%Y%m%d-%H%M%S')
+
+        stacks_file = self._output_path(stamp, 'stacks.txt')
+        file_utils.save_text(self.capture_stacks(), stacks_file)
+
+        memory_file = self._output_path(stamp, 'memory.txt')
+        file_utils.save_text(self.memory_report(), memory_file)
+
+        logger.信息(f"🩺 诊断信息已导出: {stacks_file}, {memory_file}")
+
+        if self.profile_seconds > 0:
+            logger.信息(f"🩺 开始性能采样，持续 {self.profile_seconds} 秒")
+            report, collapsed = self.sample_profile(self.profile_seconds)
+            text_file = self._output_path(stamp, 'profile.txt')
+            file_utils.save_text(report, text_file)
+            file_utils.save_text(collapsed, self._output_path(stamp, 'profile.collapsed'))
+            logger.信息(f"🩺 性能采样已导出: {text_file}")
+
+    def _output_path(self, stamp: str, suffix: str) -> str:
+        """输出文件路径：时间戳加进程号，多个实例互不覆盖"""
+        return os.path.join(self.output_dir, f"diag_{stamp}_{os.getpid()}_{suffix}")
+
+    @staticmethod
+    def capture_stacks() -> str:
+        """格式化除当前线程外所有线程的调用栈（sys._current_frames可在任意线程调用）"""
+        own = threading.get_ident()
+        names: Dict[int, str] = {thread.ident: thread.name for thread in threading.enumerate()}
+        lines: List[str] = [f"# 线程调用栈 {datetime.now().isoformat(timespec='seconds')} pid={os.getpid()}\n"]
+
+        for thread_id, frame in sys._current_frames().items():
+            if thread_id == own:
+                continue
+            lines.append(f"\n## {names.get(thread_id, '未知线程')} (id={thread_id})\n")
+            lines.extend(traceback.format_stack(frame))
+
+        return "".join(lines)
+
+    def memory_report(self) -> str:
+        """内存分配报告：与上次快照相比增长最多的前N个位置"""
+        import tracemalloc
+
+        def take_snapshot():
+            return tracemalloc.take_snapshot().filter_traces((
+                tracemalloc.Filter(False, tracemalloc.__file__),
+                tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+            ))
+
+        if not tracemalloc.is_tracing() or self._snapshot is None:
+            # 跟踪只在首次触发后开启，之前的分配无法统计
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+                self._started_tracing = True
+            self._snapshot = take_snapshot()
+            return (
+                "# 已开启内存分配跟踪，再次触发后输出与本次相比的分配变化\n"
+                f"# 跟踪会持续到进程退出，可用 kill -USR2 {os.getpid()} 关闭\n"
+            )
+
+        snapshot = take_snapshot()
+        current, peak = tracemalloc.get_traced_memory()
+        lines = [
+            f"# 内存分配变化 Top {self.top_n}",
+            f"# 当前跟踪 {current / 1024 / 1024:.1f}MB, 峰值 {peak / 1024 / 1024:.1f}MB",
+        ]
+        for stat in snapshot.compare_to(self._snapshot, 'lineno')[:self.top_n]:
+            lines.append(str(stat))
+
+        self._snapshot = snapshot
+        return "\n".join(lines) + "\n"
+
+    def stop_tracing(self) -> bool:
+        """关闭由本模块开启的内存分配跟踪，返回是否关闭"""
+        import tracemalloc
+
+        self._snapshot = None
+        if not (self._started_tracing and tracemalloc.is_tracing()):
+            return False
+
+        tracemalloc.stop()
+        self._started_tracing = False
+        logger.信息("🩺 已关闭内存分配跟踪")
+        return True
+
+    def sample_profile(self, seconds: float) -> tuple:
+        """按固定间隔采样其他线程的调用栈，返回（文本报告, 折叠栈）。
+
+        采样在后台线程进行，覆盖所有线程；折叠栈可直接用flamegraph.pl等工具生成火焰图。
+        """
+        own = threading.get_ident()
+        names: Dict[int, str] = {thread.ident: thread.name for thread in threading.enumerate()}
+        self_counts: Counter = Counter()
+        total_counts: Counter = Counter()
+        stacks: Counter = Counter()
+        samples = 0
+
+        deadline = time.monotonic() + seconds
+        while time.monotonic() < deadline and not self._stop_event.is_set():
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own:
+                    continue
+                funcs = []
+                while frame is not None:
+                    code = frame.f_code
+                    funcs.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+                    frame = frame.f_back
+                samples += 1
+                self_counts[funcs[0]] += 1
+                total_counts.update(set(funcs))
+                stacks[";".join([names.get(thread_id, str(thread_id))] + funcs[::-1])] += 1
+            self._stop_event.wait(self.sample_interval)
+
+        lines = [f"# 性能采样 {seconds} 秒, 间隔 {self.sample_interval} 秒, 共 {samples} 个样本"]
+        for title, counts in (("累计", total_counts), ("自身", self_counts)):
+            lines.append(f"\n## 按{title}样本数 Top {self.top_n}")
+            for func, count in counts.most_common(self.top_n):
+                lines.append(f"{count:8d} {count * 100 / max(samples, 1):6.1f}%  {func}")
+
+        collapsed = "".join(f"{stack} {count}\n" for stack, count in sorted(stacks.items()))
+        return "\n".join(lines) + "\n", collapsed
+
+    def stop(self):
+        """停止后台线程并关闭内存分配跟踪；在主线程调用时同时恢复原信号处理器"""
+        if threading.current_thread() is threading.main_thread():
+            for signum, previous in self._previous_handlers.items():
+                signal.signal(signum, previous if previous is not None else signal.SIG_DFL)
+            self._previous_handlers.clear()
+
+        # 可能被多个线程同时调用，只由取到线程的一方负责关闭
+        with self._lock:
+            thread, self._thread = self._thread, None
+        if thread is not None:
+            self._stop_event.set()
+            self._notify(_QUIT)
+            thread.join(5.0)
+            # 先清空再关闭，之后到达的信号不会写入被复用的文件描述符
+            read_fd, write_fd = self._read_fd, self._write_fd
+            self._read_fd = self._write_fd = None
+            os.close(read_fd)
+            os.close(write_fd)
+
+        self.stop_tracing()
+
+__all__ = ['DiagnosticsHandler']
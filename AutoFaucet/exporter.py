@@ -0,0 +1,250 @@
+# -*- coding: utf-8 -*-
+"""
+导出模块
+将成功记录和运行统计增量导出为带类型说明的CSV，安装了pyarrow时可导出为Parquet
+"""
+
+import os
+import csv
+import json
+import time
+from datetime import datetime
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+from logger import logger
+from record_store import SuccessRecordStore, RECORD_FIELDS
+from run_stats import RunStats
+from utils import file_utils
+
+# 导出表结构：(列名, 类型)
+RECORD_SCHEMA = (
+    ('id', 'int64'),
+    ('timestamp', 'timestamp'),
+    ('tx_hash', 'string'),
+    ('amount', 'string'),
+    ('wallet_address', 'string'),
+    ('network', 'string'),
+    ('ip_address', 'string'),
+)
+
+STATS_SCHEMA = (
+    ('bucket_start', 'timestamp'),
+    ('bucket_seconds', 'int64'),
+    ('attempts', 'int64'),
+    ('successes', 'int64'),
+    ('duration_sec', 'float64'),
+)
+
+TABLE_SCHEMAS = {'success_records': RECORD_SCHEMA, 'run_stats': STATS_SCHEMA}
+
+# 各表水位的初始值：成功记录按id，运行统计按时间桶编号
+INITIAL_WATERMARKS = {'success_records': 0, 'run_stats': -1}
+
+# 导出状态文件（记录每张表的导出水位）
+STATE_FILE = 'export_state.json'
+
+# 每个Parquet分片或CSV批次的行数
+BATCH_ROWS = 10000
+
+def parquet_available() -> bool:
+    """是否安装了pyarrow"""
+    try:
+        import pyarrow  # noqa: F401
+        import pyarrow.parquet  # noqa: F401
+        return True
+    except ImportError:
+        return False
+
+def _batched(rows: Iterable[Dict[str, Any]], size: int) -> Iterator[List[Dict[str, Any]]]:
+    """按固定行数分批"""
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+def _parse_timestamp(value: Any) -> Optional[datetime]:
+    """解析ISO时间字符串，无法解析时返回None"""
+    if isinstance(value, datetime):
+        return value
+    try:
+        return datetime.fromisoformat(str(value))
+    except (TypeError, ValueError):
+        return None
+
+class ColumnarExporter:
+    """增量导出器 - 按水位只追加上次导出之后的新数据，不重新读取全部历史"""
+
+    def __init__(self, output_dir: str, fmt: str = 'auto'):
+        if fmt == 'auto':
+            fmt = 'parquet' if parquet_available() else 'csv'
+        if fmt not in ('csv', 'parquet'):
+            raise ValueError(f"不支持的导出格式: {fmt}")
+        if fmt == 'parquet' and not parquet_available():
+            raise ValueError("导出Parquet需要安装pyarrow: pip install pyarrow")
+
+        self.output_dir = output_dir
+        self.format = fmt
+        self.state_path = os.path.join(output_dir, STATE_FILE)
+
+    def export(self, store: SuccessRecordStore, stats: Optional[RunStats] = None,
+               now: Optional[float] = None) -> Dict[str, int]:
+        """导出新的成功记录和已结束的统计时间桶，返回各表新导出的行数"""
+        file_utils.ensure_dir(self.output_dir)
+        state = self._load_state()
+
+        result = {'success_records': self._export_records(store, state)}
+        if stats is not None:
+            result['run_stats'] = self._export_stats(stats, state, now)
+        return result
+
+    def _load_state(self) -> Dict[str, Any]:
+        """读取导出状态；格式与本次不同时拒绝导出，避免同一目录混用两种格式"""
+        state = file_utils.load_json(self.state_path)
+        if not isinstance(state, dict):
+            return {'format': self.format, 'tables': {}}
+        if state.get('format') != self.format:
+            raise ValueError(
+                f"导出目录 {self.output_dir} 已使用 {state.get('format')} 格式，"
+                f"请更换目录或删除后重新导出"
+            )
+        state.setdefault('tables', {})
+        return state
+
+    def _save_state(self, state: Dict[str, Any]):
+        """在数据落盘之后更新水位"""
+        state['updated_at'] = datetime.now().isoformat(timespec='seconds')
+        if not file_utils.atomic_write_text(json.dumps(state, ensure_ascii=False, indent=2), self.state_path):
+            raise OSError(f"保存导出状态失败: {self.state_path}")
+
+    def _table_state(self, state: Dict[str, Any], table: str) -> Dict[str, Any]:
+        """获取表的导出状态；导出文件已被删除时从头导出"""
+        table_state = state['tables'].setdefault(table, {'watermark': INITIAL_WATERMARKS[table]})
+        output = self._csv_path(table) if self.format == 'csv' else os.path.join(self.output_dir, table)
+        if not os.path.exists(output):
+            table_state.update(watermark=INITIAL_WATERMARKS[table], size=0, rows=0)
+        return table_state
+
+    def _export_records(self, store: SuccessRecordStore, state: Dict[str, Any]) -> int:
+        """导出id大于水位的成功记录"""
+        table_state = self._table_state(state, 'success_records')
+
+        def rows():
+            for record in store.iter_after(table_state['watermark'], batch_size=BATCH_ROWS):
+                row = {field: record.get(field) for field in RECORD_FIELDS}
+                row['id'] = record['id']
+                yield row
+
+        return self._export_table('success_records', rows(), state, lambda row: row['id'])
+
+    def _export_stats(self, stats: RunStats, state: Dict[str, Any], now: Optional[float]) -> int:
+        """导出已结束的统计时间桶，当前仍在累计的桶留到下次导出"""
+        now = time.time() if now is None else now
+        table_state = self._table_state(state, 'run_stats')
+        current_bucket = int(now // stats.bucket_seconds)
+
+        rows = []
+        for bucket_id, attempts, successes, durations in stats.to_dict()['buckets']:
+            if table_state['watermark'] < bucket_id < current_bucket:
+                rows.append({
+                    'bucket_id': bucket_id,
+                    'bucket_start': datetime.fromtimestamp(bucket_id * stats.bucket_seconds).isoformat(),
+                    'bucket_seconds': stats.bucket_seconds,
+                    'attempts': attempts,
+                    'successes': successes,
+                    'duration_sec': durations,
+                })
+
+        return self._export_table('run_stats', iter(rows), state, lambda row: row['bucket_id'])
+
+    def _export_table(self, table: str, rows: Iterator[Dict[str, Any]], state: Dict[str, Any],
+                      watermark_of) -> int:
+        """按批写入并在每批落盘后推进水位"""
+        table_state = state['tables'][table]
+        schema = TABLE_SCHEMAS[table]
+        if self.format == 'csv':
+            self._truncate_csv(table, table_state.get('size', 0))
+
+        exported = 0
+        for batch in _batched(rows, BATCH_ROWS):
+            if self.format == 'csv':
+                table_state['size'] = self._append_csv(table, schema, batch)
+            else:
+                self._write_parquet(table, schema, batch)
+            table_state['watermark'] = watermark_of(batch[-1])
+            table_state['rows'] = table_state.get('rows', 0) + len(batch)
+            self._save_state(state)
+            exported += len(batch)
+
+        if exported:
+            logger.信息(f"📦 已导出 {table} {exported} 行 ({self.format})")
+        return exported
+
+    def _csv_path(self, table: str) -> str:
+        """CSV文件路径"""
+        return os.path.join(self.output_dir, f"{table}.csv")
+
+    def _truncate_csv(self, table: str, size: int):
+        """截掉上次写入后未来得及记录水位的部分，避免重复导出"""
+        path = self._csv_path(table)
+        if os.path.exists(path) and os.path.getsize(path) > size:
+            with open(path, 'r+b') as f:
+                f.truncate(size)
+
+    def _append_csv(self, table: str, schema: Tuple[Tuple[str, str], ...], batch: List[Dict[str, Any]]) -> int:
+        """追加一批行并同步到磁盘，返回文件大小；新文件先写入表头和类型说明"""
+        path = self._csv_path(table)
+        columns = [name for name, _ in schema]
+        is_new = not os.path.exists(path) or os.path.getsize(path) == 0
+        if is_new:
+            file_utils.atomic_write_text(json.dumps({
+                'table': table,
+                'format': 'csv',
+                'columns': [{'name': name, 'type': kind} for name, kind in schema]
+            }, ensure_ascii=False, indent=2), os.path.join(self.output_dir, f"{table}.schema.json"))
+
+        with open(path, 'a', encoding='utf-8', newline='') as f:
+            writer = csv.writer(f)
+            if is_new:
+                writer.writerow(columns)
+            writer.writerows([row.get(name) for name in columns] for row in batch)
+            f.flush()
+            os.fsync(f.fileno())
+            return f.tell()
+
+    def _write_parquet(self, table: str, schema: Tuple[Tuple[str, str], ...], batch: List[Dict[str, Any]]):
+        """写入一个Parquet分片；分片以首行水位命名，中断后重试会覆盖而不是重复"""
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        arrow_types = {
+            'int64': pa.int64(),
+            'float64': pa.float64(),
+            'string': pa.string(),
+            'timestamp': pa.timestamp('us'),
+        }
+        converters = {
+            'int64': lambda v: None if v is None else int(v),
+            'float64': lambda v: None if v is None else float(v),
+            'string': lambda v: None if v is None else str(v),
+            'timestamp': _parse_timestamp,
+        }
+
+        arrow_schema = pa.schema([(name, arrow_types[kind]) for name, kind in schema])
+        columns = {
+            name: [converters[kind](row.get(name)) for row in batch]
+            for name, kind in schema
+        }
+        arrow_table = pa.Table.from_pydict(columns, schema=arrow_schema)
+
+        table_dir = os.path.join(self.output_dir, table)
+        file_utils.ensure_dir(table_dir)
+        first = batch[0].get('id', batch[0].get('bucket_id'))
+        path = os.path.join(table_dir, f"part-{first:012d}.parquet")
+        tmp_path = f"{path}.tmp.{os.getpid()}"
+        pq.write_table(arrow_table, tmp_path, compression='zstd')
+        os.replace(tmp_path, path)
+
+__all__ = ['ColumnarExporter', 'RECORD_SCHEMA', 'STATS_SCHEMA', 'parquet_available']
@@ -0,0 +1,206 @@
+# -*- coding: utf-8 -*-
+"""
+后台清理模块
+在后台线程中压缩轮转日志，并按目录执行基于时间和总大小的保留策略
+"""
+
+import os
+import gzip
+import time
+import shutil
+import fnmatch
+import threading
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Dict, Iterable, List, Mapping, Optional, Any
+from logger import logger
+
+@dataclass(frozen=True)
+class RetentionRule:
+    """目录保留规则"""
+    directory: str
+    pattern: str = "*"
+    max_age_hours: float = 0  # 0表示不按时间清理
+    max_total_mb: float = 0  # 0表示不按总大小清理
+    compress: bool = False  # 是否gzip压缩匹配的未压缩文件
+    # 最近修改距今不足该时长的文件既不压缩也不删除：其他进程（如 --mode single/export）可能仍在追加写入
+    min_idle_minutes: float = 0
+
+class BackgroundJanitor:
+    """后台清理线程 - 使用os.scandir遍历，压缩与删除都不占用主线程"""
+
+    def __init__(self, rules: List[RetentionRule], interval_seconds: float = 3600,
+                 active_files: Iterable[str] = ()):
+        self.rules = rules
+        self.interval_seconds = interval_seconds
+        # 正在写入的文件（如当前日志），不压缩也不删除
+        self.active_files = {os.path.abspath(path) for path in active_files}
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self):
+        """启动清理线程"""
+        if self._thread is not None:
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, name="BackgroundJanitor", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 10.0):
+        """停止清理线程，正在处理的文件会完成后再退出"""
+        if self._thread is None:
+            return
+        self._stop_event.set()
+        self._thread.join(timeout)
+        self._thread = None
+
+    def _run(self):
+        """清理线程主循环：启动后立即执行一次，之后按间隔执行"""
+        while not self._stop_event.is_set():
+            self.run_once()
+            self._stop_event.wait(self.interval_seconds)
+
+    def run_once(self) -> Dict[str, int]:
+        """按所有规则执行一轮清理"""
+        result = {'compressed': 0, 'deleted': 0, 'freed_bytes': 0}
+        for rule in self.rules:
+            if self._stop_event.is_set():
+                break
+            try:
+                if rule.compress:
+                    result['compressed'] += self._compress_files(rule)
+                deleted, freed = self._apply_retention(rule)
+                result['deleted'] += deleted
+                result['freed_bytes'] += freed
+            except Exception as e:
+                logger.警告(f"清理目录失败 {rule.directory}: {str(e)}")
+
+        if result['compressed'] or result['deleted']:
+            logger.信息(
+                f"🧹 后台清理完成: 压缩 {result['compressed']} 个文件, "
+                f"删除 {result['deleted']} 个文件, 释放 {result['freed_bytes'] / 1024 / 1024:.1f}MB"
+            )
+        return result
+
+    def _scan(self, rule: RetentionRule) -> List[os.DirEntry]:
+        """列出规则目录下匹配且未在写入中的文件"""
+        if not os.path.isdir(rule.directory):
+            return []
+
+        idle_cutoff = time.time() - rule.min_idle_minutes * 60 if rule.min_idle_minutes > 0 else None
+        entries = []
+        with os.scandir(rule.directory) as it:
+            for entry in it:
+                if not fnmatch.fnmatch(entry.name, rule.pattern):
+                    continue
+                if os.path.abspath(entry.path) in self.active_files:
+                    continue
+                try:
+                    if not entry.is_file(follow_symlinks=False):
+                        continue
+                    if idle_cutoff is not None and entry.stat(follow_symlinks=False).st_mtime > idle_cutoff:
+                        continue
+                    entries.append(entry)
+                except OSError:
+                    continue
+        return entries
+
+    def _compress_files(self, rule: RetentionRule) -> int:
+        """压缩规则目录下的未压缩文件"""
+        count = 0
+        for entry in self._scan(rule):
+            if self._stop_event.is_set():
+                break
+            if entry.name.endswith(('.gz', '.tmp')):
+                continue
+            if self._compress_file(entry.path):
+                count += 1
+        return count
+
+    def _compress_file(self, path: str) -> bool:
+        """gzip压缩单个文件，文件名追加修改时间保证唯一"""
+        try:
+            stamp = datetime.fromtimestamp(os.stat(path).st_mtime).strftime('%Y%m%d-%H%M%S')
+            target = f"{path}.{stamp}.gz"
+            suffix = 1
+            while os.path.exists(target):
+                target = f"{path}.{stamp}-{suffix}.gz"
+                suffix += 1
+
+            # 先改名再压缩，避免与日志轮转同时操作同一个文件名
+            working = f"{path}.{os.getpid()}.compressing"
+            os.replace(path, working)
+
+            with open(working, 'rb') as src, gzip.open(target + '.tmp', 'wb', compresslevel=6) as dst:
+                shutil.copyfileobj(src, dst, 1024 * 1024)
+            os.replace(target + '.tmp', target)
+
+            # 保留原始修改时间，保留策略按原时间计算
+            stat = os.stat(working)
+            os.utime(target, (stat.st_atime, stat.st_mtime))
+            os.remove(working)
+            return True
+
+        except Exception as e:
+            logger.警告(f"压缩文件失败 {path}: {str(e)}")
+            return False
+
+    def _apply_retention(self, rule: RetentionRule) -> tuple:
+        """删除过期文件，并在总大小超限时从最旧的文件开始删除"""
+        if rule.max_age_hours <= 0 and rule.max_total_mb <= 0:
+            return 0, 0
+
+        files = []
+        for entry in self._scan(rule):
+            try:
+                stat = entry.stat(follow_symlinks=False)
+            except OSError:
+                continue
+            files.append((stat.st_mtime, stat.st_size, entry.path))
+        files.sort()
+
+        deleted = freed = 0
+        cutoff = time.time() - rule.max_age_hours * 3600 if rule.max_age_hours > 0 else None
+        total = sum(size for _, size, _ in files)
+        limit = rule.max_total_mb * 1024 * 1024 if rule.max_total_mb > 0 else None
+
+        for mtime, size, path in files:
+            expired = cutoff is not None and mtime < cutoff
+            over_limit = limit is not None and total > limit
+            if not (expired or over_limit):
+                break
+            try:
+                os.remove(path)
+                deleted += 1
+                freed += size
+                total -= size
+            except OSError:
+                continue
+
+        return deleted, freed
+
+def build_rules(config: Mapping[str, Any], log_dir: str, log_name: str = "AutoFaucet") -> List[RetentionRule]:
+    """根据维护配置生成默认的清理规则"""
+    return [
+        RetentionRule(
+            directory=log_dir,
+            pattern=f"{log_name}_*.log*",
+            max_age_hours=float(config.get("log_max_age_days", 30)) * 24,
+            max_total_mb=float(config.get("log_max_total_mb", 500)),
+            compress=bool(config.get("compress_logs", True)),
+            min_idle_minutes=float(config.get("log_min_idle_minutes", 60))
+        ),
+        RetentionRule(
+            directory="screenshots",
+            pattern="*.png",
+            max_age_hours=float(config.get("screenshot_max_age_days", 7)) * 24,
+            max_total_mb=float(config.get("screenshot_max_total_mb", 200))
+        ),
+        RetentionRule(
+            directory="temp_captcha",
+            pattern="captcha_*",
+            max_age_hours=float(config.get("temp_captcha_max_age_hours", 24))
+        ),
+    ]
+
+__all__ = ['RetentionRule', 'BackgroundJanitor', 'build_rules']
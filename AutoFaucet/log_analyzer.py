@@ -0,0 +1,172 @@
+# -*- coding: utf-8 -*-
+"""
+日志分析模块
+流式分块读取当前、轮转及gzip压缩的日志文件，按级别、错误消息和小时汇总
+"""
+
+import os
+import re
+import gzip
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import Dict, Iterator, List
+
+# 每次读取的块大小
+CHUNK_SIZE = 1024 * 1024
+
+# 单次分析最多保留的不同错误消息数，超出部分归入"其他"
+MAX_ERROR_KEYS = 5000
+
+# 错误消息归一化：数字、十六进制串替换为占位符，使同类错误聚合在一起
+_VALUE_PATTERN = re.compile(r'0x[0-9a-fA-F]+|\d+(?:\.\d+)?')
+
+_ERROR_LEVELS = (b'ERROR', b'CRITICAL')
+
+@dataclass
+class LogSummary:
+    """日志汇总结果"""
+    files: int = 0
+    bytes_read: int = 0
+    records: int = 0
+    continuation_lines: int = 0
+    first_time: str = ""
+    last_time: str = ""
+    levels: Counter = field(default_factory=Counter)
+    hours: Counter = field(default_factory=Counter)
+    errors: Counter = field(default_factory=Counter)
+
+    def merge(self, other: 'LogSummary'):
+        """合并另一份汇总"""
+        self.files += other.files
+        self.bytes_read += other.bytes_read
+        self.records += other.records
+        self.continuation_lines += other.continuation_lines
+        if other.first_time and (not self.first_time or other.first_time < self.first_time):
+            self.first_time = other.first_time
+        if other.last_time > self.last_time:
+            self.last_time = other.last_time
+        self.levels.update(other.levels)
+        self.hours.update(other.hours)
+        for message, count in other.errors.items():
+            _count_error(self.errors, message, count)
+
+def _count_error(errors: Counter, message: str, count: int = 1):
+    """计数错误消息，不同消息数达到上限后新消息归入"其他" """
+    if message in errors or len(errors) < MAX_ERROR_KEYS:
+        errors[message] += count
+    else:
+        errors['(其他)'] += count
+
+def normalize_error(message: str) -> str:
+    """归一化错误消息"""
+    message = message.lstrip('❌🚨💥 ').strip()
+    message = _VALUE_PATTERN.sub(lambda m: '0x#' if m.group().startswith('0x') else '#', message)
+    return message[:160]
+
+def find_log_files(log_dir: str, name: str = "AutoFaucet") -> List[str]:
+    """查找当前、轮转（.log.N）和压缩（.gz）的日志文件，按名称排序"""
+    if not os.path.isdir(log_dir):
+        return []
+
+    prefix = f"{name}_"
+    paths = []
+    with os.scandir(log_dir) as entries:
+        for entry in entries:
+            if entry.is_file() and entry.name.startswith(prefix) and '.log' in entry.name:
+                paths.append(entry.path)
+    return sorted(paths)
+
+def iter_lines(path: str, chunk_size: int = CHUNK_SIZE) -> Iterator[bytes]:
+    """分块读取文件并按行产出（不含换行符），gzip文件边读边解压"""
+    opener = gzip.open if path.endswith('.gz') else open
+    with opener(path, 'rb') as f:
+        remainder = b''
+        while True:
+            chunk = f.read(chunk_size)
+            if not chunk:
+                break
+            lines = (remainder + chunk).split(b'\n')
+            remainder = lines.pop()
+            yield from lines
+        if remainder:
+            yield remainder
+
+def analyze_file(path: str) -> LogSummary:
+    """分析单个日志文件"""
+    summary = LogSummary(files=1)
+    levels: Dict[bytes, int] = {}
+    hours: Dict[bytes, int] = {}
+    first_time = last_time = b''
+
+    for line in iter_lines(path):
+        summary.bytes_read += len(line) + 1
+
+        # 格式: "YYYY-MM-DD HH:MM:SS - 名称 - 级别 - 消息"，不匹配的行是多行日志的续行
+        parts = line.split(b' - ', 3)
+        if len(parts) < 4 or len(parts[0]) != 19 or parts[0][4:5] != b'-':
+            summary.continuation_lines += 1
+            continue
+
+        timestamp, level = parts[0], parts[2]
+        summary.records += 1
+        levels[level] = levels.get(level, 0) + 1
+        hour = timestamp[11:13]
+        hours[hour] = hours.get(hour, 0) + 1
+        if not first_time or timestamp < first_time:
+            first_time = timestamp
+        if timestamp > last_time:
+            last_time = timestamp
+
+        if level in _ERROR_LEVELS:
+            message = parts[3].rstrip(b'\r').decode('utf-8', errors='replace')
+            _count_error(summary.errors, normalize_error(message))
+
+    summary.levels.update({k.decode('ascii', errors='replace'): v for k, v in levels.items()})
+    summary.hours.update({k.decode('ascii', errors='replace'): v for k, v in hours.items()})
+    summary.first_time = first_time.decode('ascii', errors='replace')
+    summary.last_time = last_time.decode('ascii', errors='replace')
+    return summary
+
+def analyze_logs(paths: List[str], jobs: int = 1) -> LogSummary:
+    """分析多个日志文件，jobs>1时按文件并行"""
+    summary = LogSummary()
+    if jobs > 1 and len(paths) > 1:
+        with ProcessPoolExecutor(max_workers=jobs) as executor:
+            for result in executor.map(analyze_file, paths):
+                summary.merge(result)
+    else:
+        for path in paths:
+            summary.merge(analyze_file(path))
+    return summary
+
+def format_report(summary: LogSummary, top: int = 20) -> str:
+    """生成文本报告"""
+    lines = [
+        "📊 日志分析报告",
+        f"  文件数: {summary.files}",
+        f"  读取量: {summary.bytes_read / 1024 / 1024:.1f}MB",
+        f"  日志条数: {summary.records} (续行 {summary.continuation_lines})",
+    ]
+    if summary.first_time:
+        lines.append(f"  时间范围: {summary.first_time} ~ {summary.last_time}")
+
+    lines.append("\n按级别:")
+    for level, count in summary.levels.most_common():
+        lines.append(f"  {level:<10}{count:>10}")
+
+    lines.append("\n按小时:")
+    for hour in sorted(summary.hours):
+        count = summary.hours[hour]
+        lines.append(f"  {hour}时 {count:>10}")
+
+    lines.append(f"\n错误消息 Top {top}:")
+    for message, count in summary.errors.most_common(top):
+        lines.append(f"  {count:>8}  {message}")
+
+    return "\n".join(lines)
+
+__all__ = [
+    'LogSummary', 'find_log_files', 'iter_lines', 'analyze_file', 'analyze_logs',
+    'normalize_error', 'format_report'
+]
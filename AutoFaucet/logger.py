@@ -4,20 +4,157 @@
 提供统一的日志记录功能，支持中文日志输出
 """
 
+import atexit
 import logging
 import logging.handlers
 import os
+import queue
 import sys
+import threading
+import time
 from datetime import datetime
-from typing import Optional
-import coloredlogs
+from typing import List, Optional
 from config import config_manager
 
+try:
+    import coloredlogs
+except ImportError:  # 未安装时控制台输出不带颜色
+    coloredlogs = None
+
+class BatchingRotatingFileHandler(logging.handlers.RotatingFileHandler):
+    """支持批量写入的轮转文件处理器"""
+    
+    def write_batch(self, records: List[logging.LogRecord]):
+        """格式化一批记录并合并写入，必要时轮转文件"""
+        if not records:
+            return
+        
+        self.acquire()
+        try:
+            if self.stream is None:
+                self.stream = self._open()
+            self.stream.seek(0, 2)
+            size = self.stream.tell()
+            
+            pending = []
+            for record in records:
+                line = self.format(record) + self.terminator
+                line_size = len(line.encode(self.encoding or 'utf-8'))
+                # 写满后先落盘当前批次再轮转，保证单个文件不超过上限
+                if self.maxBytes > 0 and size > 0 and size + line_size >= self.maxBytes:
+                    self.stream.write(''.join(pending))
+                    pending = []
+                    self.doRollover()
+                    if self.stream is None:  # delay=True时轮转后不会自动重新打开
+                        self.stream = self._open()
+                    size = 0
+                pending.append(line)
+                size += line_size
+            
+            self.stream.write(''.join(pending))
+            self.stream.flush()
+        except Exception:
+            self.handleError(records[-1])
+        finally:
+            self.release()
+
+class BoundedQueueHandler(logging.handlers.QueueHandler):
+    """有积压上限的队列处理器：磁盘长时间阻塞时丢弃非错误日志并计数，内存不会无限增长"""
+    
+    def __init__(self, log_queue: queue.SimpleQueue, max_pending: int = 0):
+        super().__init__(log_queue)
+        self.max_pending = max_pending  # 0表示不限制
+        self.dropped = 0
+    
+    def emit(self, record: logging.LogRecord):
+        """积压超限时在格式化之前丢弃，错误日志始终入队"""
+        if (self.max_pending > 0 and record.levelno < logging.ERROR
+                and self.queue.qsize() >= self.max_pending):
+            self.dropped += 1
+            return
+        super().emit(record)
+
+class AsyncLogWriter:
+    """后台日志写入线程：从队列取出记录，按条数或时间批量落盘"""
+    
+    _sentinel = None
+    
+    def __init__(self, log_queue: queue.SimpleQueue, handler: BatchingRotatingFileHandler,
+                 flush_interval: float = 1.0, batch_size: int = 256,
+                 source: Optional[BoundedQueueHandler] = None):
+        self.queue = log_queue
+        self.handler = handler
+        self.flush_interval = flush_interval
+        self.batch_size = batch_size
+        self.source = source  # 用于在日志中报告被丢弃的记录数
+        self._reported_drops = 0
+        self._thread: Optional[threading.Thread] = None
+    
+    def start(self):
+        """启动写入线程"""
+        self._thread = threading.Thread(target=self._run, name="AsyncLogWriter", daemon=True)
+        self._thread.start()
+    
+    def stop(self, timeout: float = 5.0):
+        """写完队列中剩余的记录后停止线程"""
+        if self._thread is None:
+            return
+        self.queue.put_nowait(self._sentinel)
+        self._thread.join(timeout)
+        self._thread = None
+    
+    def _run(self):
+        """写入线程主循环"""
+        batch = []
+        deadline = 0.0
+        
+        while True:
+            try:
+                if batch:
+                    record = self.queue.get(timeout=max(0.0, deadline - time.monotonic()))
+                else:
+                    record = self.queue.get()
+            except queue.Empty:
+                # 到达时间上限
+                self._write(batch)
+                batch = []
+                continue
+            
+            if record is self._sentinel:
+                break
+            
+            if not batch:
+                deadline = time.monotonic() + self.flush_interval
+            batch.append(record)
+            
+            # 达到条数上限或出现错误日志时立即落盘
+            if len(batch) >= self.batch_size or record.levelno >= logging.ERROR:
+                self._write(batch)
+                batch = []
+        
+        self._write(batch)
+    
+    def _write(self, batch: List[logging.LogRecord]):
+        """写入一批记录，有新丢弃的记录时追加一条警告"""
+        dropped = self.source.dropped if self.source is not None else 0
+        if dropped > self._reported_drops:
+            batch.append(logging.makeLogRecord({
+                'name': batch[-1].name if batch else 'AutoFaucet',
+                'levelno': logging.WARNING,
+                'levelname': 'WARNING',
+                'msg': f"⚠️ 日志队列积压，已丢弃 {dropped - self._reported_drops} 条日志",
+            }))
+            self._reported_drops = dropped
+        self.handler.write_batch(batch)
+
 class ChineseLogger:
     """中文日志记录器"""
     
     def __init__(self, name: str = "AutoFaucet", log_file: Optional[str] = None):
         self.name = name
+        self.file_handler: Optional[BatchingRotatingFileHandler] = None
+        self.queue_handler: Optional[BoundedQueueHandler] = None
+        self.writer: Optional[AsyncLogWriter] = None
         self.logger = logging.getLogger(name)
         self.logger.setLevel(logging.DEBUG)
         
@@ -34,21 +171,37 @@ class ChineseLogger:
             datefmt="%Y-%m-%d %H:%M:%S"
         )
         
+        # 记录器级别取各处理器中最低的级别，低于它的日志在调用处直接跳过
+        enabled_levels = []
+        
         # 控制台处理器
         if log_config.get("console_enabled", True):
-            self._setup_console_handler(log_config.get("level", "INFO"))
+            console_level = log_config.get("level", "INFO")
+            self._setup_console_handler(console_level)
+            enabled_levels.append(getattr(logging, console_level.upper()))
         
         # 文件处理器
         if log_config.get("file_enabled", True):
             if log_file is None:
                 log_file = f"logs/{name}_{datetime.now().strftime('%Y%m%d')}.log"
             self._setup_file_handler(log_file, log_config)
+            enabled_levels.append(self.file_handler.level)
+        
+        self.logger.setLevel(min(enabled_levels) if enabled_levels else logging.CRITICAL + 1)
     
     def _setup_console_handler(self, level: str):
         """设置控制台处理器"""
         console_handler = logging.StreamHandler(sys.stdout)
         console_handler.setLevel(getattr(logging, level.upper()))
         
+        if coloredlogs is None:
+            console_handler.setFormatter(logging.Formatter(
+                fmt='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+                datefmt='%H:%M:%S'
+            ))
+            self.logger.addHandler(console_handler)
+            return
+        
         # 使用coloredlogs为控制台添加颜色
         coloredlogs.install(
             level=level.upper(),
@@ -82,16 +235,49 @@ class ChineseLogger:
         max_bytes = self._parse_size(log_config.get("max_file_size", "10MB"))
         backup_count = log_config.get("backup_count", 5)
         
-        file_handler = logging.handlers.RotatingFileHandler(
+        file_handler = BatchingRotatingFileHandler(
             log_file,
             maxBytes=max_bytes,
             backupCount=backup_count,
-            encoding='utf-8'
+            encoding='utf-8',
+            delay=True  # 首次写入时才创建文件
         )
-        file_handler.setLevel(logging.DEBUG)
+        file_level = getattr(logging, log_config.get("file_level", "DEBUG").upper())
+        file_handler.setLevel(file_level)
         file_handler.setFormatter(self.formatter)
+        self.file_handler = file_handler
+        
+        if not log_config.get("async_enabled", True):
+            self.logger.addHandler(file_handler)
+            return
         
-        self.logger.addHandler(file_handler)
+        # 调用线程仍要格式化消息（QueueHandler.prepare），写盘和轮转交给后台线程。
+        # SimpleQueue.put可重入，信号处理器打断正在记录日志的主线程时不会死锁
+        log_queue = queue.SimpleQueue()
+        self.queue_handler = BoundedQueueHandler(log_queue, int(log_config.get("max_queue_size", 10000)))
+        self.queue_handler.setLevel(file_level)
+        self.writer = AsyncLogWriter(
+            log_queue,
+            file_handler,
+            flush_interval=float(log_config.get("flush_interval", 1.0)),
+            batch_size=int(log_config.get("flush_batch_size", 256)),
+            source=self.queue_handler
+        )
+        self.writer.start()
+        self.logger.addHandler(self.queue_handler)
+        atexit.register(self.close)
+    
+    def close(self):
+        """停止后台写入线程并落盘剩余日志，之后的日志改为同步写入"""
+        if self.writer is None:
+            return
+        
+        # 先挂上同步处理器再摘除队列，切换期间不丢日志
+        self.logger.addHandler(self.file_handler)
+        self.logger.removeHandler(self.queue_handler)
+        self.writer.stop()
+        self.writer = None
+        self.queue_handler = None
     
     def _parse_size(self, size_str: str) -> int:
         """解析文件大小字符串"""
@@ -129,122 +315,152 @@ class ChineseLogger:
         """异常日志（包含堆栈信息）"""
         self.logger.exception(message, *args, **kwargs)
     
+    def is_enabled(self, level: int) -> bool:
+        """判断该级别的日志是否会被输出"""
+        return self.logger.isEnabledFor(level)
+    
     # 中文日志方法
+    # 先判断级别再拼接消息，级别关闭时几乎没有开销；
+    # 动态内容以参数形式传入，由处理器在真正输出时才格式化
     def 调试(self, message: str, *args, **kwargs):
         """调试日志（中文）"""
-        self.debug(f"🔍 {message}", *args, **kwargs)
+        if self.logger.isEnabledFor(logging.DEBUG):
+            self.logger.debug("🔍 " + message, *args, **kwargs)
     
     def 信息(self, message: str, *args, **kwargs):
         """信息日志（中文）"""
-        self.info(f"ℹ️ {message}", *args, **kwargs)
+        if self.logger.isEnabledFor(logging.INFO):
+            self.logger.info("ℹ️ " + message, *args, **kwargs)
     
     def 警告(self, message: str, *args, **kwargs):
         """警告日志（中文）"""
-        self.warning(f"⚠️ {message}", *args, **kwargs)
+        if self.logger.isEnabledFor(logging.WARNING):
+            self.logger.warning("⚠️ " + message, *args, **kwargs)
     
     def 错误(self, message: str, *args, **kwargs):
         """错误日志（中文）"""
-        self.error(f"❌ {message}", *args, **kwargs)
+        if self.logger.isEnabledFor(logging.ERROR):
+            self.logger.error("❌ " + message, *args, **kwargs)
     
     def 严重错误(self, message: str, *args, **kwargs):
         """严重错误日志（中文）"""
-        self.critical(f"🚨 {message}", *args, **kwargs)
+        if self.logger.isEnabledFor(logging.CRITICAL):
+            self.logger.critical("🚨 " + message, *args, **kwargs)
     
     def 异常(self, message: str, *args, **kwargs):
         """异常日志（中文）"""
-        self.exception(f"💥 {message}", *args, **kwargs)
+        if self.logger.isEnabledFor(logging.ERROR):
+            self.logger.exception("💥 " + message, *args, **kwargs)
     
     def 成功(self, message: str, *args, **kwargs):
         """成功日志（中文）"""
-        self.info(f"✅ {message}", *args, **kwargs)
+        if self.logger.isEnabledFor(logging.INFO):
+            self.logger.info("✅ " + message, *args, **kwargs)
     
     # 操作日志方法
     def 开始操作(self, operation: str, target: str = ""):
         """记录操作开始"""
-        msg = f"🚀 开始{operation}"
+        if not self.logger.isEnabledFor(logging.INFO):
+            return
         if target:
-            msg += f" - 目标: {target}"
-        self.info(msg)
+            self.logger.info("🚀 开始%s - 目标: %s", operation, target)
+        else:
+            self.logger.info("🚀 开始%s", operation)
     
     def 完成操作(self, operation: str, result: str = "成功"):
         """记录操作完成"""
         if result == "成功":
-            self.info(f"✅ {operation}完成 - {result}")
-        else:
-            self.error(f"❌ {operation}失败 - {result}")
+            if self.logger.isEnabledFor(logging.INFO):
+                self.logger.info("✅ %s完成 - %s", operation, result)
+        elif self.logger.isEnabledFor(logging.ERROR):
+            self.logger.error("❌ %s失败 - %s", operation, result)
     
     def 步骤(self, step: str, details: str = ""):
         """记录操作步骤"""
-        msg = f"📝 步骤: {step}"
+        if not self.logger.isEnabledFor(logging.INFO):
+            return
         if details:
-            msg += f" - {details}"
-        self.info(msg)
+            self.logger.info("📝 步骤: %s - %s", step, details)
+        else:
+            self.logger.info("📝 步骤: %s", step)
     
     def 等待(self, reason: str, duration: float = 0):
         """记录等待操作"""
-        msg = f"⏳ 等待: {reason}"
+        if not self.logger.isEnabledFor(logging.INFO):
+            return
         if duration > 0:
-            msg += f" ({duration}秒)"
-        self.info(msg)
+            self.logger.info("⏳ 等待: %s (%s秒)", reason, duration)
+        else:
+            self.logger.info("⏳ 等待: %s", reason)
     
     def 点击(self, element: str):
         """记录点击操作"""
-        self.info(f"👆 点击: {element}")
+        if self.logger.isEnabledFor(logging.INFO):
+            self.logger.info("👆 点击: %s", element)
     
     def 输入(self, element: str, content: str = "***"):
         """记录输入操作"""
-        self.info(f"⌨️ 输入: {element} -> {content}")
+        if self.logger.isEnabledFor(logging.INFO):
+            self.logger.info("⌨️ 输入: %s -> %s", element, content)
     
     def 导航(self, url: str):
         """记录页面导航"""
-        self.info(f"🌐 导航到: {url}")
+        if self.logger.isEnabledFor(logging.INFO):
+            self.logger.info("🌐 导航到: %s", url)
     
     def 检测(self, item: str, result: str):
         """记录检测结果"""
-        if "成功" in result or "找到" in result:
-            self.info(f"🔍 检测{item}: {result}")
-        else:
-            self.warning(f"🔍 检测{item}: {result}")
+        level = logging.INFO if ("成功" in result or "找到" in result) else logging.WARNING
+        if self.logger.isEnabledFor(level):
+            self.logger.log(level, "🔍 检测%s: %s", item, result)
     
     def 验证码(self, action: str, result: str = ""):
         """记录验证码相关操作"""
-        msg = f"🔐 验证码{action}"
+        if not self.logger.isEnabledFor(logging.INFO):
+            return
         if result:
-            msg += f": {result}"
-        self.info(msg)
+            self.logger.info("🔐 验证码%s: %s", action, result)
+        else:
+            self.logger.info("🔐 验证码%s", action)
     
     def 钱包(self, action: str, address: str = ""):
         """记录钱包相关操作"""
-        msg = f"💰 钱包{action}"
+        if not self.logger.isEnabledFor(logging.INFO):
+            return
         if address:
             # 隐藏地址中间部分
             masked_address = f"{address[:6]}...{address[-4:]}" if len(address) > 10 else address
-            msg += f": {masked_address}"
-        self.info(msg)
+            self.logger.info("💰 钱包%s: %s", action, masked_address)
+        else:
+            self.logger.info("💰 钱包%s", action)
     
     def 网络请求(self, method: str, url: str, status: int = 0):
         """记录网络请求"""
-        msg = f"🌐 {method} {url}"
+        if not self.logger.isEnabledFor(logging.INFO):
+            return
         if status > 0:
-            if 200 <= status < 300:
-                msg += f" ✅ {status}"
-            else:
-                msg += f" ❌ {status}"
-        self.info(msg)
+            mark = "✅" if 200 <= status < 300 else "❌"
+            self.logger.info("🌐 %s %s %s %s", method, url, mark, status)
+        else:
+            self.logger.info("🌐 %s %s", method, url)
     
     def 代理(self, action: str, proxy: str = ""):
         """记录代理相关操作"""
-        msg = f"🔄 代理{action}"
+        if not self.logger.isEnabledFor(logging.INFO):
+            return
         if proxy:
-            msg += f": {proxy}"
-        self.info(msg)
+            self.logger.info("🔄 代理%s: %s", action, proxy)
+        else:
+            self.logger.info("🔄 代理%s", action)
     
     def 反检测(self, action: str, details: str = ""):
         """记录反检测操作"""
-        msg = f"🛡️ 反检测: {action}"
+        if not self.logger.isEnabledFor(logging.DEBUG):
+            return
         if details:
-            msg += f" - {details}"
-        self.debug(msg)
+            self.logger.debug("🛡️ 反检测: %s - %s", action, details)
+        else:
+            self.logger.debug("🛡️ 反检测: %s", action)
 
 # 创建全局日志实例
 logger = ChineseLogger()
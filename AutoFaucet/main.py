@@ -10,22 +10,31 @@ import sys
 import time
 import signal
 import argparse
-from typing import Optional, Dict, Any
-from datetime import datetime, timedelta
+from typing import Optional, Dict, Any, TYPE_CHECKING
+from datetime import datetime
 
 # 添加当前目录到Python路径
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
 from config import ConfigManager, FaucetConfig
 from logger import logger
-from browser_manager import BrowserManager
-from captcha_solver import CaptchaSolver
-from faucet_handler import FaucetHandler
+from record_store import SuccessRecordStore
+from scheduler import ClaimScheduler
+from run_stats import RunStats, ROLLING_WINDOWS
+from janitor import BackgroundJanitor, build_rules
+from diagnostics import DiagnosticsHandler
 from utils import (
     network_utils, file_utils, time_utils, 
     system_utils, config_validator
 )
 
+# 浏览器与验证码模块依赖selenium、OpenCV等重量级库，在initialize()中才导入，
+# 使 --help、--create-config 等轻量命令不必加载它们
+if TYPE_CHECKING:
+    from browser_manager import BrowserManager
+    from captcha_solver import CaptchaSolver
+    from faucet_handler import FaucetHandler
+
 class AutoFaucetBot:
     """自动领水机器人主类"""
     
@@ -33,28 +42,64 @@ class AutoFaucetBot:
         """初始化机器人"""
         self.config_path = config_path
         self.config_manager = ConfigManager(config_path)
-        self.browser_manager: Optional[BrowserManager] = None
-        self.captcha_solver: Optional[CaptchaSolver] = None
-        self.faucet_handler: Optional[FaucetHandler] = None
+        self.browser_manager: Optional['BrowserManager'] = None
+        self.captcha_solver: Optional['CaptchaSolver'] = None
+        self.faucet_handler: Optional['FaucetHandler'] = None
         self.running = False
-        self.stats = {
-            'total_attempts': 0,
-            'successful_claims': 0,
-            'failed_claims': 0,
-            'captcha_solved': 0,
-            'captcha_failed': 0,
-            'start_time': None,
-            'last_success_time': None
-        }
+        self.stop_signal: Optional[int] = None  # 收到的退出信号，由主流程在信号处理器之外处理
+        self.logs_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'logs')
+        self.record_store: Optional[SuccessRecordStore] = None
+        self.scheduler = ClaimScheduler(os.path.join(self.logs_dir, 'schedule_state.json'))
+        self.stats = RunStats(os.path.join(self.logs_dir, 'run_stats.json'))
+        self.janitor: Optional[BackgroundJanitor] = None
+        self.diagnostics: Optional[DiagnosticsHandler] = None
         
         # 注册信号处理器
         signal.signal(signal.SIGINT, self._signal_handler)
         signal.signal(signal.SIGTERM, self._signal_handler)
+        self._install_diagnostics()
     
     def _signal_handler(self, signum, frame):
-        """信号处理器"""
-        logger.信息("收到退出信号，正在安全关闭...")
-        self.stop()
+        """信号处理器：只记录信号并唤醒等待，日志与清理由主流程完成。
+        
+        信号可能打断正在记录日志或持有锁的主线程，处理器中不能记录日志、调用stop()
+        或获取非可重入锁；scheduler.stop()只写唤醒套接字。
+        非连续模式下Ctrl-C按KeyboardInterrupt中断当前操作；SIGTERM由单次领取与组件测试
+        在步骤之间检查。再次收到同一信号时按默认方式立即中断。
+        """
+        continuous = self.running
+        self.stop_signal = signum
+        self.running = False
+        self.scheduler.stop()
+        signal.signal(signum, signal.default_int_handler if signum == signal.SIGINT else signal.SIG_DFL)
+        
+        if signum == signal.SIGINT and not continuous:
+            raise KeyboardInterrupt
+    
+    def _stop_requested(self) -> bool:
+        """单次领取与组件测试在步骤之间检查是否收到退出信号"""
+        if self.stop_signal is None:
+            return False
+        
+        logger.警告("收到退出信号，中止当前操作")
+        return True
+    
+    def _install_diagnostics(self):
+        """注册诊断信号：kill -USR1 <pid> 导出线程调用栈和内存分配变化到 logs/diagnostics/，
+        kill -USR2 <pid> 关闭内存分配跟踪"""
+        diagnostics_config = self.config_manager.get_diagnostics_config()
+        if not diagnostics_config.get("enabled", True):
+            return
+        
+        self.diagnostics = DiagnosticsHandler(
+            os.path.join(self.logs_dir, 'diagnostics'),
+            top_n=int(diagnostics_config.get("top_n", 20)),
+            profile_seconds=float(diagnostics_config.get("profile_seconds", 0))
+        )
+        if self.diagnostics.install():
+            logger.调试(f"诊断信号已注册: kill -USR1 {os.getpid()}（kill -USR2 关闭内存跟踪）")
+        else:
+            self.diagnostics = None
     
     def initialize(self) -> bool:
         """初始化所有组件"""
@@ -91,6 +136,10 @@ class AutoFaucetBot:
             
             logger.成功("配置验证通过")
             
+            from browser_manager import BrowserManager
+            from captcha_solver import CaptchaSolver
+            from faucet_handler import FaucetHandler
+            
             # 初始化浏览器管理器
             self.browser_manager = BrowserManager()
             logger.信息("浏览器管理器初始化完成")
@@ -103,6 +152,9 @@ class AutoFaucetBot:
             self.faucet_handler = FaucetHandler()
             logger.信息("水龙头处理器初始化完成")
             
+            # 启动后台清理
+            self._start_janitor()
+            
             # 显示配置信息
             self._display_config_info()
             
@@ -112,9 +164,30 @@ class AutoFaucetBot:
             logger.错误(f"初始化失败: {str(e)}")
             return False
     
+    def _start_janitor(self):
+        """启动后台清理线程：压缩轮转日志，清理过期截图与验证码临时文件"""
+        maintenance_config = self.config_manager.get_maintenance_config()
+        if not maintenance_config.get("enabled", True):
+            return
+        
+        active_files = []
+        log_dir = self.logs_dir
+        if logger.file_handler is not None:
+            active_files.append(logger.file_handler.baseFilename)
+            log_dir = os.path.dirname(logger.file_handler.baseFilename)
+        
+        self.janitor = BackgroundJanitor(
+            build_rules(maintenance_config, log_dir, logger.name),
+            interval_seconds=float(maintenance_config.get("interval_minutes", 60)) * 60,
+            active_files=active_files
+        )
+        self.janitor.start()
+        logger.信息("后台清理线程已启动")
+    
     def _validate_config(self) -> list:
         """验证配置"""
-        errors = []
+        # 加载时发现的无效字段（已临时使用默认值），不带着错误配置运行
+        errors = list(self.config_manager.load_errors)
         
         # 验证水龙头配置
         faucet_config = self.config_manager.get_faucet_config("0g_testnet")
@@ -156,23 +229,31 @@ class AutoFaucetBot:
     
     def run_single_claim(self) -> bool:
         """执行单次领取"""
+        if self._stop_requested():
+            return False
+        
+        started = time.time()
+        success = False
+        captcha_failed = False
+        interrupted = False
+        
         try:
-            self.stats['total_attempts'] += 1
-            
-            logger.信息(f"🎯 开始第 {self.stats['total_attempts']} 次领取尝试")
+            logger.信息(f"🎯 开始第 {self.stats.total_attempts + 1} 次领取尝试")
             
             # 启动浏览器
             if not self.browser_manager.start_browser():
                 logger.错误("浏览器启动失败")
-                self.stats['failed_claims'] += 1
+                return False
+            
+            if self._stop_requested():
+                interrupted = True
                 return False
             
             # 执行领取流程
             result = self.faucet_handler.claim_tokens()
             
             if result['success']:
-                self.stats['successful_claims'] += 1
-                self.stats['last_success_time'] = datetime.now()
+                success = True
                 logger.成功(f"✅ 领取成功! 交易哈希: {result.get('tx_hash', 'N/A')}")
                 
                 # 保存成功记录
@@ -180,30 +261,32 @@ class AutoFaucetBot:
                 
                 return True
             else:
-                self.stats['failed_claims'] += 1
                 logger.错误(f"❌ 领取失败: {result.get('error', '未知错误')}")
                 
                 # 如果是验证码相关错误，更新统计
-                if 'captcha' in result.get('error', '').lower():
-                    self.stats['captcha_failed'] += 1
+                captcha_failed = 'captcha' in result.get('error', '').lower()
                 
                 return False
                 
         except Exception as e:
             logger.错误(f"领取过程中发生异常: {str(e)}")
-            self.stats['failed_claims'] += 1
             return False
         
         finally:
             # 关闭浏览器
             if self.browser_manager:
                 self.browser_manager.close_browser()
+            
+            # 更新并保存统计（被退出信号中止的不计入尝试）
+            if not interrupted:
+                self.stats.record_attempt(success, time.time() - started, captcha_failed=captcha_failed)
+                self.stats.checkpoint()
     
     def run_continuous(self, interval_hours: float = 24.0, max_attempts: int = 0):
         """连续运行模式"""
         try:
             self.running = True
-            self.stats['start_time'] = datetime.now()
+            self.stats.start_time = datetime.now()
             
             logger.信息(f"🔄 启动连续运行模式")
             logger.信息(f"  间隔时间: {interval_hours} 小时")
@@ -214,6 +297,13 @@ class AutoFaucetBot:
             
             attempt_count = 0
             
+            # 恢复上次保存的计划，避免重启后提前领取
+            next_run = self.scheduler.load_next_run()
+            if next_run and next_run > time.time():
+                next_run_str = datetime.fromtimestamp(next_run).strftime('%Y-%m-%d %H:%M:%S')
+                logger.信息(f"⏰ 恢复上次计划，下次运行时间: {next_run_str}")
+                self._wait_until(next_run)
+            
             while self.running:
                 if max_attempts > 0 and attempt_count >= max_attempts:
                     logger.信息(f"达到最大尝试次数 {max_attempts}，停止运行")
@@ -229,12 +319,13 @@ class AutoFaucetBot:
                 if not self.running:
                     break
                 
-                # 计算下次运行时间
-                next_run_time = datetime.now() + timedelta(hours=interval_hours)
-                logger.信息(f"⏰ 下次运行时间: {next_run_time.strftime('%Y-%m-%d %H:%M:%S')}")
+                # 计算并持久化下次运行时间
+                next_run = self.scheduler.schedule_next(self._get_claim_interval(interval_hours))
+                next_run_str = datetime.fromtimestamp(next_run).strftime('%Y-%m-%d %H:%M:%S')
+                logger.信息(f"⏰ 下次运行时间: {next_run_str}")
                 
-                # 等待间隔时间
-                self._wait_with_progress(interval_hours * 3600)
+                # 等待到下次运行时间
+                self._wait_until(next_run)
             
         except KeyboardInterrupt:
             logger.信息("用户中断运行")
@@ -243,46 +334,52 @@ class AutoFaucetBot:
         finally:
             self.stop()
     
-    def _wait_with_progress(self, total_seconds: float):
-        """带进度显示的等待"""
+    def _get_claim_interval(self, interval_hours: float) -> float:
+        """计算领取间隔（秒），不短于水龙头的冷却时间"""
+        interval = interval_hours
+        
+        faucet_config = self.config_manager.get_faucet_config("0g_testnet")
+        if faucet_config and faucet_config.cooldown_hours > interval:
+            logger.信息(f"  间隔时间 {interval_hours} 小时短于冷却时间，按 {faucet_config.cooldown_hours} 小时计算")
+            interval = faucet_config.cooldown_hours
+        
+        return interval * 3600
+    
+    def _wait_until(self, deadline: float):
+        """等待到指定时间戳，期间按进度边界显示剩余时间，收到停止信号立即返回"""
         try:
-            start_time = time.time()
-            
-            while self.running and (time.time() - start_time) < total_seconds:
-                elapsed = time.time() - start_time
-                remaining = total_seconds - elapsed
-                
-                if remaining <= 0:
-                    break
-                
-                # 每10分钟显示一次进度
-                if int(elapsed) % 600 == 0 and int(elapsed) > 0:
-                    remaining_str = time_utils.format_duration(remaining)
-                    logger.信息(f"⏳ 等待中，剩余时间: {remaining_str}")
-                
-                # 短暂睡眠
-                time.sleep(1)
-                
+            if not self.scheduler.wait_until(deadline):
+                self.running = False
         except KeyboardInterrupt:
             self.running = False
     
     def _display_stats(self):
         """显示统计信息"""
         logger.信息("📊 运行统计:")
-        logger.信息(f"  总尝试次数: {self.stats['total_attempts']}")
-        logger.信息(f"  成功次数: {self.stats['successful_claims']}")
-        logger.信息(f"  失败次数: {self.stats['failed_claims']}")
+        logger.信息(f"  总尝试次数: {self.stats.total_attempts}")
+        logger.信息(f"  成功次数: {self.stats.successful_claims}")
+        logger.信息(f"  失败次数: {self.stats.failed_claims}")
         
-        if self.stats['total_attempts'] > 0:
-            success_rate = (self.stats['successful_claims'] / self.stats['total_attempts']) * 100
+        if self.stats.total_attempts > 0:
+            success_rate = (self.stats.successful_claims / self.stats.total_attempts) * 100
             logger.信息(f"  成功率: {success_rate:.1f}%")
         
-        if self.stats['start_time']:
-            runtime = datetime.now() - self.stats['start_time']
+        # 滚动窗口统计
+        rolling = self.stats.rolling()
+        for name, _ in ROLLING_WINDOWS:
+            window = rolling[name]
+            if window['attempts'] > 0:
+                logger.信息(
+                    f"  近{name}: 尝试 {window['attempts']} 次, 成功率 {window['success_rate']:.1f}%, "
+                    f"平均耗时 {time_utils.format_duration(window['avg_duration'])}"
+                )
+        
+        if self.stats.start_time:
+            runtime = datetime.now() - self.stats.start_time
             logger.信息(f"  运行时间: {time_utils.format_duration(runtime.total_seconds())}")
         
-        if self.stats['last_success_time']:
-            last_success = datetime.now() - self.stats['last_success_time']
+        if self.stats.last_success_time:
+            last_success = datetime.now() - self.stats.last_success_time
             logger.信息(f"  上次成功: {time_utils.format_duration(last_success.total_seconds())}前")
     
     def _save_success_record(self, result: Dict[str, Any]):
@@ -297,39 +394,60 @@ class AutoFaucetBot:
                 'ip_address': network_utils.get_public_ip()
             }
             
-            # 确保logs目录存在
-            logs_dir = os.path.join(os.path.dirname(__file__), 'logs')
-            file_utils.ensure_dir(logs_dir)
-            
-            # 保存到日志文件
-            log_file = os.path.join(logs_dir, 'success_records.json')
-            
-            # 加载现有记录
-            records = file_utils.load_json(log_file) or []
-            records.append(record)
-            
-            # 保存更新后的记录
-            file_utils.save_json(records, log_file)
+            # 追加写入记录存储
+            self._get_record_store().append(record)
             
         except Exception as e:
             logger.错误(f"保存成功记录失败: {str(e)}")
     
+    def _get_record_store(self) -> SuccessRecordStore:
+        """获取成功记录存储，首次使用时打开并迁移旧的JSON记录"""
+        if self.record_store is None:
+            file_utils.ensure_dir(self.logs_dir)
+            self.record_store = SuccessRecordStore(
+                os.path.join(self.logs_dir, 'success_records.db'),
+                legacy_json_path=os.path.join(self.logs_dir, 'success_records.json')
+            )
+        return self.record_store
+    
     def stop(self):
         """停止运行"""
         self.running = False
+        self.scheduler.stop()
         
+        if self.stop_signal is not None:
+            logger.信息("收到退出信号，正在安全关闭...")
+            self.stop_signal = None
         logger.信息("🛑 正在停止自动领水脚本...")
         
         # 关闭浏览器
         if self.browser_manager:
             self.browser_manager.close_browser()
         
-        # 显示最终统计
-        if self.stats['total_attempts'] > 0:
+        # 停止诊断线程并关闭内存分配跟踪
+        if self.diagnostics:
+            self.diagnostics.stop()
+        
+        # 停止后台清理
+        if self.janitor:
+            self.janitor.stop()
+            self.janitor = None
+        
+        # 关闭成功记录存储
+        if self.record_store:
+            self.record_store.close()
+            self.record_store = None
+        
+        # 保存并显示最终统计
+        self.stats.checkpoint()
+        if self.stats.total_attempts > 0:
             logger.信息("📈 最终统计:")
             self._display_stats()
         
         logger.信息("✅ 脚本已安全退出")
+        
+        # 落盘后台队列中的日志
+        logger.close()
     
     def test_components(self) -> bool:
         """测试各组件功能"""
@@ -343,12 +461,18 @@ class AutoFaucetBot:
                 return False
             logger.成功("网络连接测试通过")
             
+            if self._stop_requested():
+                return False
+            
             # 测试浏览器启动
             logger.信息("测试浏览器启动...")
             if not self.browser_manager.start_browser():
                 logger.错误("浏览器启动测试失败")
                 return False
             
+            if self._stop_requested():
+                return False
+            
             # 测试导航
             logger.信息("测试页面导航...")
             if not self.browser_manager.navigate_to("https://www.google.com"):
@@ -360,6 +484,9 @@ class AutoFaucetBot:
             # 关闭浏览器
             self.browser_manager.close_browser()
             
+            if self._stop_requested():
+                return False
+            
             # 测试验证码服务
             logger.信息("测试验证码服务...")
             # 这里可以添加验证码服务的测试
@@ -372,30 +499,93 @@ class AutoFaucetBot:
             logger.错误(f"组件测试失败: {str(e)}")
             return False
 
-def create_default_config():
+def create_default_config(config_path: str = "config.yaml"):
     """创建默认配置文件"""
-    config_manager = ConfigManager()
+    config_manager = ConfigManager(config_path)
     config_manager.save_config()
-    logger.成功("默认配置文件已创建: config.yaml")
+    logger.成功(f"默认配置文件已创建: {config_manager.config_path}")
+
+def analyze_log_history(log_dir: str, top: int = 20, jobs: int = 1) -> bool:
+    """流式分析日志目录中的历史日志"""
+    from log_analyzer import find_log_files, analyze_logs, format_report
+    
+    paths = find_log_files(log_dir)
+    if not paths:
+        logger.警告(f"未找到日志文件: {log_dir}")
+        return False
+    
+    start = time.time()
+    summary = analyze_logs(paths, jobs=jobs)
+    print(format_report(summary, top=top))
+    print(f"\n分析耗时: {time_utils.format_duration(time.time() - start)}")
+    return True
+
+def export_history(log_dir: str, export_dir: Optional[str] = None, fmt: str = 'auto') -> bool:
+    """将成功记录和运行统计增量导出为列式文件"""
+    from exporter import ColumnarExporter
+    
+    export_dir = export_dir or os.path.join(log_dir, 'export')
+    try:
+        exporter = ColumnarExporter(export_dir, fmt)
+    except ValueError as e:
+        logger.错误(str(e))
+        return False
+    
+    file_utils.ensure_dir(log_dir)
+    store = SuccessRecordStore(
+        os.path.join(log_dir, 'success_records.db'),
+        legacy_json_path=os.path.join(log_dir, 'success_records.json')
+    )
+    try:
+        result = exporter.export(store, RunStats(os.path.join(log_dir, 'run_stats.json')))
+    except (OSError, ValueError) as e:
+        logger.错误(f"导出失败: {str(e)}")
+        return False
+    finally:
+        store.close()
+    
+    print(f"导出目录: {export_dir} ({exporter.format})")
+    for table, rows in result.items():
+        print(f"  {table}: 新增 {rows} 行")
+    return True
 
 def main():
     """主函数"""
     parser = argparse.ArgumentParser(description='0G测试网自动领水脚本')
     parser.add_argument('--config', '-c', default='config.yaml', help='配置文件路径')
-    parser.add_argument('--mode', '-m', choices=['single', 'continuous', 'test'], 
-                       default='single', help='运行模式')
+    parser.add_argument('--mode', '-m', choices=['single', 'continuous', 'test', 'analyze', 'export'], 
+                       default='single', help='运行模式（analyze: 分析历史日志，export: 导出记录和统计）')
     parser.add_argument('--interval', '-i', type=float, default=24.0, 
                        help='连续模式的间隔时间（小时）')
     parser.add_argument('--max-attempts', '-n', type=int, default=0, 
                        help='最大尝试次数（0表示无限制）')
     parser.add_argument('--create-config', action='store_true', 
                        help='创建默认配置文件')
+    parser.add_argument('--log-dir', default=os.path.join(os.path.dirname(os.path.abspath(__file__)), 'logs'),
+                       help='日志目录（analyze/export模式）')
+    parser.add_argument('--top', type=int, default=20, 
+                       help='显示的错误消息条数（analyze模式）')
+    parser.add_argument('--jobs', '-j', type=int, default=1, 
+                       help='并行分析的进程数（analyze模式）')
+    parser.add_argument('--export-dir', default=None, 
+                       help='导出目录，默认为日志目录下的export（export模式）')
+    parser.add_argument('--format', choices=['auto', 'csv', 'parquet'], default='auto', 
+                       help='导出格式，auto在安装了pyarrow时使用parquet（export模式）')
     
     args = parser.parse_args()
     
     # 创建默认配置
     if args.create_config:
-        create_default_config()
+        create_default_config(args.config)
+        return
+    
+    # 日志分析不需要初始化浏览器等组件
+    if args.mode == 'analyze':
+        analyze_log_history(args.log_dir, args.top, args.jobs)
+        return
+    
+    if args.mode == 'export':
+        export_history(args.log_dir, args.export_dir, args.format)
         return
     
     # 检查配置文件是否存在
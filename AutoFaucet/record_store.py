@@ -0,0 +1,235 @@
+# -*- coding: utf-8 -*-
+"""
+成功记录存储模块
+基于SQLite的追加写入存储，替代每次整体重写的JSON文件
+"""
+
+import os
+import json
+import sqlite3
+import threading
+from datetime import datetime
+from typing import Any, Dict, Iterator, Optional, Union
+from logger import logger
+
+# 成功记录的字段顺序
+RECORD_FIELDS = ('timestamp', 'tx_hash', 'amount', 'wallet_address', 'network', 'ip_address')
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS success_records (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    timestamp TEXT NOT NULL,
+    tx_hash TEXT,
+    amount,
+    wallet_address TEXT,
+    network TEXT,
+    ip_address TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_success_records_timestamp ON success_records (timestamp);
+CREATE TABLE IF NOT EXISTS migrations (
+    source TEXT PRIMARY KEY,
+    migrated_at TEXT NOT NULL,
+    record_count INTEGER NOT NULL
+);
+"""
+
+TimeBound = Optional[Union[str, datetime]]
+
+class SuccessRecordStore:
+    """成功记录存储 - 每条记录一次追加写入，写入开销不随历史增长"""
+
+    def __init__(self, db_path: str, legacy_json_path: Optional[str] = None):
+        self.db_path = db_path
+        self._lock = threading.Lock()
+
+        db_dir = os.path.dirname(db_path)
+        if db_dir:
+            os.makedirs(db_dir, exist_ok=True)
+
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        # WAL模式下追加写入不会阻塞读取，崩溃时也不会损坏已提交的数据
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+
+        if legacy_json_path:
+            self.migrate_from_json(legacy_json_path)
+
+    def append(self, record: Dict[str, Any]) -> bool:
+        """追加一条成功记录"""
+        try:
+            values = self._to_row(record)
+            if values[0] is None:
+                values[0] = datetime.now().isoformat()
+
+            with self._lock, self._conn:
+                self._conn.execute(
+                    f"INSERT INTO success_records ({', '.join(RECORD_FIELDS)}) "
+                    f"VALUES ({', '.join('?' * len(RECORD_FIELDS))})",
+                    values
+                )
+            return True
+
+        except Exception as e:
+            logger.错误(f"追加成功记录失败: {str(e)}")
+            return False
+
+    def iter_records(self, since: TimeBound = None, until: TimeBound = None,
+                     batch_size: int = 500) -> Iterator[Dict[str, Any]]:
+        """按时间顺序流式遍历记录，since包含、until不包含"""
+        sql = f"SELECT id, {', '.join(RECORD_FIELDS)} FROM success_records"
+        conditions = []
+        params = []
+        if since is not None:
+            conditions.append("timestamp >= ?")
+            params.append(self._to_timestamp(since))
+        if until is not None:
+            conditions.append("timestamp < ?")
+            params.append(self._to_timestamp(until))
+        if conditions:
+            sql += " WHERE " + " AND ".join(conditions)
+        sql += " ORDER BY timestamp, id"
+
+        cursor = self._conn.execute(sql, params)
+        try:
+            while True:
+                rows = cursor.fetchmany(batch_size)
+                if not rows:
+                    break
+                for row in rows:
+                    yield dict(row)
+        finally:
+            cursor.close()
+
+    def iter_after(self, after_id: int = 0, batch_size: int = 500) -> Iterator[Dict[str, Any]]:
+        """按写入顺序流式遍历id大于after_id的记录，用于增量导出"""
+        cursor = self._conn.execute(
+            f"SELECT id, {', '.join(RECORD_FIELDS)} FROM success_records WHERE id > ? ORDER BY id",
+            (after_id,)
+        )
+        try:
+            while True:
+                rows = cursor.fetchmany(batch_size)
+                if not rows:
+                    break
+                for row in rows:
+                    yield dict(row)
+        finally:
+            cursor.close()
+
+    def count(self, since: TimeBound = None) -> int:
+        """统计记录数量"""
+        if since is None:
+            row = self._conn.execute("SELECT COUNT(*) FROM success_records").fetchone()
+        else:
+            row = self._conn.execute(
+                "SELECT COUNT(*) FROM success_records WHERE timestamp >= ?",
+                (self._to_timestamp(since),)
+            ).fetchone()
+        return row[0]
+
+    def latest(self) -> Optional[Dict[str, Any]]:
+        """获取最新一条记录"""
+        row = self._conn.execute(
+            f"SELECT id, {', '.join(RECORD_FIELDS)} FROM success_records "
+            "ORDER BY timestamp DESC, id DESC LIMIT 1"
+        ).fetchone()
+        return dict(row) if row else None
+
+    def migrate_from_json(self, json_path: str) -> int:
+        """一次性导入旧的JSON数组记录文件，完成后将其重命名为 .migrated
+        
+        无法导入的记录跳过并计数，不影响其余记录；已迁移过的文件再次出现时不重复导入，
+        另存为新的备份文件，不覆盖已有备份。
+        """
+        if not os.path.exists(json_path):
+            return 0
+
+        source = os.path.abspath(json_path)
+        try:
+            already = self._conn.execute(
+                "SELECT record_count FROM migrations WHERE source = ?", (source,)
+            ).fetchone()
+
+            if already is not None:
+                backup = self._backup_path(json_path)
+                if backup != json_path + '.migrated':
+                    logger.警告(f"{json_path} 已迁移过，未重复导入，已另存为 {backup}，请检查后手动处理")
+                os.rename(json_path, backup)
+                return already[0]
+
+            with open(json_path, 'r', encoding='utf-8') as f:
+                records = json.load(f) or []
+
+            count = skipped = 0
+            unknown_fields = set()
+            insert_sql = (
+                f"INSERT INTO success_records ({', '.join(RECORD_FIELDS)}) "
+                f"VALUES ({', '.join('?' * len(RECORD_FIELDS))})"
+            )
+
+            # 导入与迁移标记在同一事务中提交，重命名前崩溃也不会重复导入
+            with self._lock, self._conn:
+                for record in records:
+                    if not isinstance(record, dict) or not record.get('timestamp'):
+                        skipped += 1
+                        continue
+                    unknown_fields.update(set(record) - set(RECORD_FIELDS))
+                    try:
+                        self._conn.execute(insert_sql, self._to_row(record))
+                        count += 1
+                    except (sqlite3.Error, TypeError, ValueError, OverflowError):
+                        skipped += 1
+                self._conn.execute(
+                    "INSERT INTO migrations (source, migrated_at, record_count) VALUES (?, ?, ?)",
+                    (source, datetime.now().isoformat(), count)
+                )
+
+            logger.信息(f"已从 {json_path} 迁移 {count} 条成功记录")
+            if skipped:
+                logger.警告(f"迁移时跳过 {skipped} 条无法导入的记录，原文件保留在备份中")
+            if unknown_fields:
+                logger.警告(f"迁移时忽略了不在记录格式中的字段: {', '.join(sorted(unknown_fields))}")
+
+            os.rename(json_path, self._backup_path(json_path))
+            return count
+
+        except Exception as e:
+            logger.错误(f"迁移成功记录失败 {json_path}: {str(e)}")
+            return 0
+
+    @staticmethod
+    def _backup_path(json_path: str) -> str:
+        """迁移后的备份文件名，已存在时追加序号，不覆盖旧备份"""
+        backup = json_path + '.migrated'
+        index = 1
+        while os.path.exists(backup):
+            backup = f"{json_path}.migrated.{index}"
+            index += 1
+        return backup
+
+    @staticmethod
+    def _to_row(record: Dict[str, Any]) -> list:
+        """按字段顺序取值，字典、列表等非标量值序列化为JSON字符串"""
+        row = []
+        for field in RECORD_FIELDS:
+            value = record.get(field)
+            if value is not None and not isinstance(value, (str, int, float)):
+                value = json.dumps(value, ensure_ascii=False, default=str)
+            row.append(value)
+        return row
+
+    def close(self):
+        """关闭数据库连接"""
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    @staticmethod
+    def _to_timestamp(value: Union[str, datetime]) -> str:
+        """将时间边界转换为与存储一致的ISO字符串"""
+        return value.isoformat() if isinstance(value, datetime) else value
+
+__all__ = ['SuccessRecordStore', 'RECORD_FIELDS']
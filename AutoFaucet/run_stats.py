@@ -0,0 +1,166 @@
+# -*- coding: utf-8 -*-
+"""
+运行统计模块
+固定大小的时间桶环形数组，O(1)更新，提供滚动窗口统计并可持久化
+"""
+
+import json
+import time
+from array import array
+from datetime import datetime
+from typing import Dict, Optional
+from logger import logger
+from utils import file_utils
+
+# 滚动窗口（名称, 秒数）
+ROLLING_WINDOWS = (
+    ('1小时', 3600),
+    ('24小时', 24 * 3600),
+    ('7天', 7 * 24 * 3600),
+)
+
+class RunStats:
+    """运行统计 - 累计计数加按时间分桶的环形数组，内存占用与运行时长无关"""
+
+    def __init__(self, state_file: Optional[str] = None, bucket_seconds: int = 300,
+                 retention_seconds: int = 7 * 24 * 3600):
+        self.state_file = state_file
+        self.bucket_seconds = bucket_seconds
+        self.bucket_count = retention_seconds // bucket_seconds
+
+        # 累计统计
+        self.total_attempts = 0
+        self.successful_claims = 0
+        self.failed_claims = 0
+        self.captcha_solved = 0
+        self.captcha_failed = 0
+        self.last_success_time: Optional[datetime] = None
+
+        # 本次进程的启动时间，不持久化
+        self.start_time: Optional[datetime] = None
+
+        # 环形数组：每个槽位记录所属的桶编号及该桶内的统计
+        self._bucket_ids = array('q', [-1]) * self.bucket_count
+        self._attempts = array('l', [0]) * self.bucket_count
+        self._successes = array('l', [0]) * self.bucket_count
+        self._durations = array('d', [0.0]) * self.bucket_count
+
+        if state_file:
+            self.load()
+
+    def _slot(self, timestamp: float) -> Optional[int]:
+        """获取时间戳对应的槽位，槽位过期时先清空；时间早于保留范围时返回None"""
+        bucket_id = int(timestamp // self.bucket_seconds)
+        slot = bucket_id % self.bucket_count
+        if self._bucket_ids[slot] > bucket_id:
+            return None
+        if self._bucket_ids[slot] != bucket_id:
+            self._bucket_ids[slot] = bucket_id
+            self._attempts[slot] = 0
+            self._successes[slot] = 0
+            self._durations[slot] = 0.0
+        return slot
+
+    def record_attempt(self, success: bool, duration: float, captcha_failed: bool = False,
+                       timestamp: Optional[float] = None):
+        """记录一次领取尝试"""
+        timestamp = time.time() if timestamp is None else timestamp
+
+        self.total_attempts += 1
+        if success:
+            self.successful_claims += 1
+            self.last_success_time = datetime.fromtimestamp(timestamp)
+        else:
+            self.failed_claims += 1
+        if captcha_failed:
+            self.captcha_failed += 1
+
+        slot = self._slot(timestamp)
+        if slot is None:
+            return
+        self._attempts[slot] += 1
+        self._successes[slot] += 1 if success else 0
+        self._durations[slot] += duration
+
+    def window(self, seconds: int, now: Optional[float] = None) -> Dict[str, float]:
+        """统计最近seconds秒内的尝试次数、成功率和平均耗时"""
+        now = time.time() if now is None else now
+        newest = int(now // self.bucket_seconds)
+        oldest = newest - min(self.bucket_count, -(-seconds // self.bucket_seconds)) + 1
+
+        attempts = successes = 0
+        durations = 0.0
+        for slot, bucket_id in enumerate(self._bucket_ids):
+            if oldest <= bucket_id <= newest:
+                attempts += self._attempts[slot]
+                successes += self._successes[slot]
+                durations += self._durations[slot]
+
+        return {
+            'attempts': attempts,
+            'successes': successes,
+            'success_rate': successes / attempts * 100 if attempts else 0.0,
+            'avg_duration': durations / attempts if attempts else 0.0
+        }
+
+    def rolling(self, now: Optional[float] = None) -> Dict[str, Dict[str, float]]:
+        """获取全部滚动窗口的统计"""
+        return {name: self.window(seconds, now) for name, seconds in ROLLING_WINDOWS}
+
+    def to_dict(self) -> Dict:
+        """导出为可序列化的字典，只保留非空的桶"""
+        buckets = [
+            [self._bucket_ids[slot], self._attempts[slot], self._successes[slot],
+             round(self._durations[slot], 3)]
+            for slot in range(self.bucket_count)
+            if self._bucket_ids[slot] >= 0 and self._attempts[slot]
+        ]
+        buckets.sort()
+
+        return {
+            'total_attempts': self.total_attempts,
+            'successful_claims': self.successful_claims,
+            'failed_claims': self.failed_claims,
+            'captcha_solved': self.captcha_solved,
+            'captcha_failed': self.captcha_failed,
+            'last_success_time': self.last_success_time.isoformat() if self.last_success_time else None,
+            'bucket_seconds': self.bucket_seconds,
+            'buckets': buckets
+        }
+
+    def checkpoint(self) -> bool:
+        """将统计写入磁盘"""
+        if not self.state_file:
+            return False
+        return file_utils.atomic_write_text(json.dumps(self.to_dict(), ensure_ascii=False), self.state_file)
+
+    def load(self) -> bool:
+        """从磁盘恢复统计"""
+        state = file_utils.load_json(self.state_file)
+        if not isinstance(state, dict):
+            return False
+
+        try:
+            self.total_attempts = int(state.get('total_attempts', 0))
+            self.successful_claims = int(state.get('successful_claims', 0))
+            self.failed_claims = int(state.get('failed_claims', 0))
+            self.captcha_solved = int(state.get('captcha_solved', 0))
+            self.captcha_failed = int(state.get('captcha_failed', 0))
+            if state.get('last_success_time'):
+                self.last_success_time = datetime.fromisoformat(state['last_success_time'])
+
+            # 桶大小变化后旧的分桶数据无法对齐，只保留累计统计
+            if state.get('bucket_seconds') == self.bucket_seconds:
+                for bucket_id, attempts, successes, durations in state.get('buckets', []):
+                    slot = self._slot(bucket_id * self.bucket_seconds)
+                    if slot is not None:
+                        self._attempts[slot] = attempts
+                        self._successes[slot] = successes
+                        self._durations[slot] = durations
+            return True
+
+        except Exception as e:
+            logger.警告(f"运行统计恢复失败，重新开始统计: {str(e)}")
+            return False
+
+__all__ = ['RunStats', 'ROLLING_WINDOWS']
@@ -0,0 +1,107 @@
+# -*- coding: utf-8 -*-
+"""
+调度模块
+连续运行模式的领取调度：睡眠到下次截止时间或停止信号，并持久化下次运行时间
+"""
+
+import json
+import time
+import select
+import socket
+from datetime import datetime
+from typing import Optional
+from logger import logger
+from utils import file_utils, time_utils
+
+class ClaimScheduler:
+    """领取调度器 - 不做逐秒轮询，只在进度边界、截止时间或停止时唤醒
+
+    等待阻塞在一对本地套接字上，stop()只设置标志并写入一个字节，不获取任何锁，
+    可以在信号处理器中调用（threading.Event.set()会争用被打断的主线程持有的锁）。
+    """
+
+    def __init__(self, state_file: str, progress_interval: float = 600):
+        self.state_file = state_file
+        self.progress_interval = progress_interval
+        self._stopped = False
+        # socketpair在Windows上也能用于select，管道不行
+        self._wake_recv, self._wake_send = socket.socketpair()
+        self._wake_recv.setblocking(False)
+        self._wake_send.setblocking(False)
+
+    def stop(self):
+        """发出停止信号，立即唤醒正在等待的线程（可在信号处理器中调用）"""
+        self._stopped = True
+        try:
+            self._wake_send.send(b'x')
+        except OSError:
+            pass  # 缓冲区已满说明已有未处理的唤醒，或已关闭
+
+    @property
+    def stopped(self) -> bool:
+        """是否已停止"""
+        return self._stopped
+
+    def close(self):
+        """停止并释放唤醒用的套接字，之后不能再等待（不要与wait_until()并发调用）"""
+        self.stop()
+        self._wake_recv.close()
+        self._wake_send.close()
+
+    def load_next_run(self) -> Optional[float]:
+        """读取持久化的下次运行时间（时间戳）"""
+        state = file_utils.load_json(self.state_file)
+        if not isinstance(state, dict):
+            return None
+
+        try:
+            return float(state['next_run'])
+        except (KeyError, TypeError, ValueError):
+            return None
+
+    def save_next_run(self, next_run: float) -> bool:
+        """持久化下次运行时间，重启后据此恢复计划"""
+        state = {
+            'next_run': next_run,
+            'next_run_str': datetime.fromtimestamp(next_run).strftime('%Y-%m-%d %H:%M:%S'),
+            'updated_at': datetime.now().isoformat()
+        }
+        return file_utils.atomic_write_text(json.dumps(state, ensure_ascii=False, indent=2), self.state_file)
+
+    def schedule_next(self, interval_seconds: float) -> float:
+        """从当前时间起安排下次运行并持久化，返回下次运行时间戳"""
+        next_run = time.time() + interval_seconds
+        self.save_next_run(next_run)
+        return next_run
+
+    def wait_until(self, deadline: float) -> bool:
+        """等待到截止时间戳，到期返回True，收到停止信号返回False"""
+        start = time.time()
+        next_report = start + self.progress_interval
+
+        while not self._stopped:
+            now = time.time()
+            if now >= deadline:
+                return True
+
+            # 按真实的进度边界报告，系统挂起等原因错过的边界只补报一次
+            if now >= next_report:
+                logger.信息(f"⏳ 等待中，剩余时间: {time_utils.format_duration(deadline - now)}")
+                while next_report <= now:
+                    next_report += self.progress_interval
+
+            self._sleep(min(deadline, next_report) - now)
+
+        return False
+
+    def _sleep(self, timeout: float):
+        """睡眠到超时或被stop()唤醒"""
+        readable, _, _ = select.select([self._wake_recv], [], [], max(timeout, 0))
+        if readable:
+            try:
+                while self._wake_recv.recv(64):
+                    pass
+            except OSError:
+                pass  # 已读空
+
+__all__ = ['ClaimScheduler']
@@ -0,0 +1,165 @@
+# -*- coding: utf-8 -*-
+"""
+测试公共夹具
+所有测试离线运行：禁止真实网络连接，网络工具与浏览器层使用假实现。
+测试之间不共享可变状态，可以用 pytest-xdist 并行运行（pytest -n auto）。
+"""
+
+import os
+import sys
+import random
+import signal
+import socket
+from typing import Any, Dict, List, Optional
+
+import pytest
+
+# 项目模块使用顶层导入（from logger import logger），将项目目录加入路径
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PROJECT_DIR)
+
+from logger import logger
+from utils import NetworkUtils
+
+# 测试期间日志只输出到控制台（由pytest捕获），不写入项目的logs目录
+logger.close()
+if logger.file_handler is not None:
+    logger.logger.removeHandler(logger.file_handler)
+    logger.file_handler.close()
+    logger.file_handler = None
+
+FAKE_PUBLIC_IP = "203.0.113.7"
+
+class FakeResponse:
+    """假HTTP响应"""
+
+    def __init__(self, status_code: int = 200, text: str = "", json_data: Any = None):
+        self.status_code = status_code
+        self.text = text
+        self._json_data = json_data
+
+    def json(self) -> Any:
+        return self._json_data
+
+class FakeRequests:
+    """假requests模块：按URL返回预设响应，并记录所有请求"""
+
+    def __init__(self):
+        self.responses: Dict[str, FakeResponse] = {}
+        self.calls: List[Dict[str, Any]] = []
+
+    def add(self, url: str, status_code: int = 200, text: str = "", json_data: Any = None):
+        self.responses[url] = FakeResponse(status_code, text, json_data)
+
+    def _request(self, method: str, url: str, **kwargs) -> FakeResponse:
+        self.calls.append({'method': method, 'url': url, **kwargs})
+        if url not in self.responses:
+            raise OSError(f"离线测试中未预设的请求: {method} {url}")
+        return self.responses[url]
+
+    def get(self, url: str, **kwargs) -> FakeResponse:
+        return self._request('GET', url, **kwargs)
+
+    def post(self, url: str, **kwargs) -> FakeResponse:
+        return self._request('POST', url, **kwargs)
+
+class FakeBrowserManager:
+    """假浏览器管理器：记录启动和关闭次数"""
+
+    def __init__(self, start_ok: bool = True):
+        self.start_ok = start_ok
+        self.started = 0
+        self.closed = 0
+        self.driver = None
+
+    def start_browser(self, headless: bool = False, proxy: Optional[str] = None) -> bool:
+        self.started += 1
+        return self.start_ok
+
+    def close_browser(self):
+        self.closed += 1
+
+class FakeFaucetHandler:
+    """假水龙头处理器：依次返回预设的领取结果，结果为异常时抛出"""
+
+    def __init__(self, results: List[Any]):
+        self.results = list(results)
+        self.calls = 0
+
+    def claim_tokens(self) -> Dict[str, Any]:
+        self.calls += 1
+        result = self.results.pop(0)
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+@pytest.fixture(autouse=True)
+def no_network(monkeypatch):
+    """禁止真实网络连接，意外的联网调用立即失败而不是等待超时"""
+    original_connect = socket.socket.connect
+
+    def guarded_connect(sock, address):
+        if sock.family == getattr(socket, 'AF_UNIX', None):
+            return original_connect(sock, address)
+        raise OSError(f"离线测试禁止网络连接: {address}")
+
+    def guarded_create_connection(address, *args, **kwargs):
+        raise OSError(f"离线测试禁止网络连接: {address}")
+
+    monkeypatch.setattr(socket.socket, 'connect', guarded_connect)
+    monkeypatch.setattr(socket, 'create_connection', guarded_create_connection)
+
+@pytest.fixture(autouse=True)
+def seeded_random():
+    """固定随机种子，使随机等待、随机字符串等结果可复现"""
+    random.seed(0)
+
+@pytest.fixture
+def fake_requests(monkeypatch) -> FakeRequests:
+    """替换延迟导入的requests模块"""
+    fake = FakeRequests()
+    monkeypatch.setitem(sys.modules, 'requests', fake)
+    return fake
+
+@pytest.fixture
+def fake_network(monkeypatch):
+    """网络工具返回固定结果：网络可用，公网IP固定"""
+    monkeypatch.setattr(NetworkUtils, 'check_internet_connection', staticmethod(lambda timeout=5: True))
+    monkeypatch.setattr(NetworkUtils, 'get_public_ip', staticmethod(lambda: FAKE_PUBLIC_IP))
+
+@pytest.fixture
+def config_file(tmp_path) -> str:
+    """每个测试独立的配置文件副本"""
+    path = tmp_path / 'config.yaml'
+    with open(os.path.join(PROJECT_DIR, 'config.yaml'), 'rb') as src:
+        path.write_bytes(src.read())
+    return str(path)
+
+@pytest.fixture
+def bot(tmp_path, config_file, fake_network):
+    """状态文件都写入临时目录的机器人实例"""
+    from main import AutoFaucetBot
+    from run_stats import RunStats
+    from scheduler import ClaimScheduler
+
+    # 机器人会注册退出与诊断信号的处理器，测试结束后恢复
+    signals = [signal.SIGINT, signal.SIGTERM] + [
+        getattr(signal, name) for name in ('SIGUSR1', 'SIGUSR2') if hasattr(signal, name)
+    ]
+    handlers = {signum: signal.getsignal(signum) for signum in signals}
+
+    instance = AutoFaucetBot(config_file)
+    instance.logs_dir = str(tmp_path / 'logs')
+    instance.scheduler.close()
+    instance.scheduler = ClaimScheduler(os.path.join(instance.logs_dir, 'schedule_state.json'), progress_interval=0.1)
+    instance.stats = RunStats(os.path.join(instance.logs_dir, 'run_stats.json'))
+    if instance.diagnostics is not None:
+        instance.diagnostics.output_dir = os.path.join(instance.logs_dir, 'diagnostics')
+    yield instance
+    instance.scheduler.close()
+    if instance.diagnostics is not None:
+        instance.diagnostics.stop()
+    if instance.record_store is not None:
+        instance.record_store.close()
+    for signum, handler in handlers.items():
+        signal.signal(signum, handler)
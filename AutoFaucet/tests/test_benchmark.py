@@ -0,0 +1,40 @@
+# -*- coding: utf-8 -*-
+"""基准测试脚本的冒烟测试与基线对比逻辑"""
+
+import pytest
+
+import benchmark
+
+@pytest.mark.parametrize("name", ["logger_helpers", "config", "format_duration"])
+def test_benchmark_runs(name):
+    results = benchmark.BENCHMARKS[name](20)
+
+    assert results
+    assert all(benchmark.result_metric(item) > 0 for item in results)
+
+def test_baseline_round_trip(tmp_path):
+    path = str(tmp_path / 'baseline.json')
+    results = {'demo': [{'name': 'fast', 'ns_per_call': 100.0}, {'name': 'slow', 'p50_ns': 2000.0}]}
+
+    benchmark.save_baseline(path, results, count=100)
+
+    assert benchmark.check_baseline(path, results, count=100, threshold=0.3)
+
+def test_regression_is_detected(tmp_path):
+    path = str(tmp_path / 'baseline.json')
+    benchmark.save_baseline(path, {'demo': [{'name': 'fast', 'ns_per_call': 100.0}]}, 100)
+
+    assert benchmark.check_baseline(path, {'demo': [{'name': 'fast', 'ns_per_call': 125.0}]}, 100, 0.3)
+    assert not benchmark.check_baseline(path, {'demo': [{'name': 'fast', 'ns_per_call': 140.0}]}, 100, 0.3)
+
+def test_missing_baseline_fails(tmp_path):
+    assert not benchmark.check_baseline(str(tmp_path / 'missing.json'), {}, 100, 0.3)
+
+def test_baseline_records_machine(tmp_path):
+    import json
+
+    path = str(tmp_path / 'baseline.json')
+    benchmark.save_baseline(path, {'demo': [{'name': 'fast', 'ns_per_call': 100.0}]}, 100)
+
+    with open(path, encoding='utf-8') as f:
+        assert json.load(f)['machine'] == benchmark.machine_info()
@@ -0,0 +1,144 @@
+# -*- coding: utf-8 -*-
+"""主程序领取流程测试（浏览器与水龙头处理器使用假实现）"""
+
+import os
+import signal
+import threading
+import time
+
+import pytest
+
+from conftest import FAKE_PUBLIC_IP, FakeBrowserManager, FakeFaucetHandler
+
+SUCCESS = {'success': True, 'tx_hash': '0xabc', 'amount': '0.1', 'network': '0G Testnet'}
+
+def _attach(bot, results, start_ok=True):
+    bot.browser_manager = FakeBrowserManager(start_ok)
+    bot.faucet_handler = FakeFaucetHandler(results)
+    return bot.browser_manager, bot.faucet_handler
+
+def test_successful_claim_is_recorded(bot):
+    browser, _ = _attach(bot, [SUCCESS])
+
+    assert bot.run_single_claim()
+
+    record = bot._get_record_store().latest()
+    assert record['tx_hash'] == '0xabc'
+    assert record['ip_address'] == FAKE_PUBLIC_IP
+    assert (bot.stats.total_attempts, bot.stats.successful_claims) == (1, 1)
+    assert browser.started == browser.closed == 1
+
+def test_captcha_failure_is_counted(bot):
+    _attach(bot, [{'success': False, 'error': 'Captcha not solved'}])
+
+    assert not bot.run_single_claim()
+    assert bot.stats.failed_claims == 1
+    assert bot.stats.captcha_failed == 1
+    assert bot._get_record_store().count() == 0
+
+def test_browser_start_failure(bot):
+    browser, handler = _attach(bot, [SUCCESS], start_ok=False)
+
+    assert not bot.run_single_claim()
+    assert handler.calls == 0
+    assert browser.closed == 1
+    assert bot.stats.failed_claims == 1
+
+def test_handler_exception_closes_browser(bot):
+    browser, _ = _attach(bot, [RuntimeError("页面崩溃")])
+
+    assert not bot.run_single_claim()
+    assert browser.closed == 1
+    assert bot.stats.total_attempts == 1
+
+def test_stats_are_checkpointed(bot):
+    from run_stats import RunStats
+
+    _attach(bot, [SUCCESS])
+    bot.run_single_claim()
+
+    assert RunStats(bot.stats.state_file).successful_claims == 1
+
+def test_claim_interval_respects_cooldown(bot):
+    cooldown = bot.config_manager.get_faucet_config("0g_testnet").cooldown_hours
+
+    assert bot._get_claim_interval(cooldown / 2) == cooldown * 3600
+    assert bot._get_claim_interval(cooldown + 1) == (cooldown + 1) * 3600
+
+def test_continuous_mode_runs_max_attempts(bot, monkeypatch):
+    _, handler = _attach(bot, [SUCCESS, {'success': False, 'error': '超时'}])
+    monkeypatch.setattr(bot, '_get_claim_interval', lambda interval_hours: 0.05)
+
+    bot.run_continuous(interval_hours=1, max_attempts=2)
+
+    assert handler.calls == 2
+    assert (bot.stats.successful_claims, bot.stats.failed_claims) == (1, 1)
+    assert bot.scheduler.load_next_run() is not None
+
+def test_continuous_mode_resumes_schedule(bot):
+    _, handler = _attach(bot, [SUCCESS])
+    bot.scheduler.save_next_run(time.time() + 30)
+    threading.Timer(0.1, bot.stop).start()
+
+    start = time.monotonic()
+    bot.run_continuous(interval_hours=1)
+
+    # 上次计划的时间未到，停止前不应领取
+    assert handler.calls == 0
+    assert time.monotonic() - start < 5
+
+def test_signal_handler_only_requests_stop(bot, monkeypatch):
+    from logger import logger
+
+    # 信号处理器中记录日志可能与被打断的主线程争用同一把锁
+    def fail(*args, **kwargs):
+        raise AssertionError("信号处理器中不应记录日志")
+    monkeypatch.setattr(logger, '信息', fail)
+
+    bot._signal_handler(signal.SIGTERM, None)
+
+    assert bot.stop_signal == signal.SIGTERM
+    assert not bot.running
+    assert bot.scheduler.stopped
+    assert signal.getsignal(signal.SIGTERM) == signal.SIG_DFL
+
+def test_sigterm_aborts_single_claim(bot, monkeypatch):
+    browser, handler = _attach(bot, [SUCCESS])
+    start_browser = browser.start_browser
+
+    # 启动浏览器期间收到SIGTERM：不再继续领取，也不计入尝试
+    def start_and_signal(*args, **kwargs):
+        bot._signal_handler(signal.SIGTERM, None)
+        return start_browser(*args, **kwargs)
+    monkeypatch.setattr(browser, 'start_browser', start_and_signal)
+
+    assert not bot.run_single_claim()
+    assert handler.calls == 0
+    assert browser.closed == 1
+    assert bot.stats.total_attempts == 0
+
+def test_sigint_interrupts_single_mode(bot):
+    with pytest.raises(KeyboardInterrupt):
+        bot._signal_handler(signal.SIGINT, None)
+
+    assert bot.stop_signal == signal.SIGINT
+    assert signal.getsignal(signal.SIGINT) == signal.default_int_handler
+
+def test_sigint_only_requests_stop_in_continuous_mode(bot):
+    bot.running = True
+    bot._signal_handler(signal.SIGINT, None)
+
+    assert not bot.running
+    assert bot.scheduler.stopped
+
+def test_signal_stops_continuous_mode(bot):
+    _, handler = _attach(bot, [SUCCESS])
+    bot.scheduler.save_next_run(time.time() + 30)
+    threading.Timer(0.1, os.kill, (os.getpid(), signal.SIGTERM)).start()
+
+    start = time.monotonic()
+    bot.run_continuous(interval_hours=1)
+
+    assert handler.calls == 0
+    assert bot.stop_signal is None  # 已由stop()在主流程中处理
+    assert time.monotonic() - start < 5
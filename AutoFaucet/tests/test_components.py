@@ -0,0 +1,86 @@
+# -*- coding: utf-8 -*-
+"""模块导入、组件初始化与冷启动耗时测试"""
+
+import os
+import subprocess
+import sys
+
+import pytest
+
+from conftest import PROJECT_DIR
+
+# 轻量命令的冷启动导入耗时预算（毫秒）
+STARTUP_IMPORT_BUDGET_MS = 500
+
+# 轻量命令不应加载的重量级依赖
+HEAVY_MODULES = (
+    'selenium', 'undetected_chromedriver', 'webdriver_manager', 'fake_useragent',
+    'cv2', 'numpy', 'pytesseract', 'requests'
+)
+
+@pytest.mark.parametrize("module", [
+    'atomic_file', 'config', 'logger', 'utils', 'record_store', 'scheduler', 'run_stats',
+    'log_analyzer', 'janitor', 'main'
+])
+def test_core_modules_import(module):
+    __import__(module)
+
+def test_browser_manager_init():
+    pytest.importorskip("selenium")
+    pytest.importorskip("fake_useragent")
+    from browser_manager import BrowserManager
+
+    browser_manager = BrowserManager()
+    assert browser_manager.driver is None
+
+def test_captcha_solver_init(tmp_path, monkeypatch):
+    pytest.importorskip("requests")
+    from captcha_solver import CaptchaSolver
+
+    monkeypatch.chdir(tmp_path)
+    captcha_solver = CaptchaSolver()
+
+    assert os.path.isdir(tmp_path / captcha_solver.temp_dir)
+
+def _measure_startup(args, cwd):
+    """运行 main.py 的轻量命令，返回顶层导入总耗时（毫秒）和加载的顶层包"""
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', os.path.join(PROJECT_DIR, 'main.py')] + args,
+        capture_output=True, text=True, timeout=60, cwd=cwd
+    )
+    assert result.returncode == 0, result.stderr[-500:]
+
+    # 输出格式: "import time: 自身 | 累计 | 模块名"，顶层模块名前只有一个空格
+    total_us = 0
+    loaded = set()
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:'):
+            continue
+        parts = line.split('|')
+        if len(parts) != 3 or not parts[1].strip().isdigit():
+            continue
+        loaded.add(parts[2].strip().split('.')[0])
+        if not parts[2].startswith('  '):
+            total_us += int(parts[1])
+    return total_us / 1000, loaded
+
+@pytest.mark.parametrize("command", ['help', 'create_config'])
+def test_startup_import_budget(command, tmp_path):
+    # 在临时目录中运行，日志和新建的配置文件不写入项目目录
+    config_path = str(tmp_path / 'config.yaml')
+    args = ['--help'] if command == 'help' else ['--create-config', '--config', config_path]
+    project_config = os.path.join(PROJECT_DIR, 'config.yaml')
+    project_mtime = os.stat(project_config).st_mtime_ns
+
+    total_ms, loaded = _measure_startup(args, str(tmp_path))
+    assert not loaded.intersection(HEAVY_MODULES)
+    if command == 'create_config':
+        assert os.path.exists(config_path)
+
+    # 并行运行时其他测试进程会抢占CPU，取多次中的最好成绩
+    for _ in range(2):
+        if total_ms <= STARTUP_IMPORT_BUDGET_MS:
+            break
+        total_ms = min(total_ms, _measure_startup(args, str(tmp_path))[0])
+    assert total_ms <= STARTUP_IMPORT_BUDGET_MS
+    assert os.stat(project_config).st_mtime_ns == project_mtime
@@ -0,0 +1,181 @@
+# -*- coding: utf-8 -*-
+"""配置管理测试"""
+
+import copy
+import os
+
+import pytest
+
+from config import ConfigManager
+
+def test_default_config_sections(config_file):
+    default_config = ConfigManager(config_file).get_default_config()
+
+    for section in ('faucet', 'browser', 'captcha', 'proxy'):
+        assert hasattr(default_config, section)
+
+def test_missing_file_creates_default(tmp_path):
+    path = str(tmp_path / 'config.yaml')
+    manager = ConfigManager(path)
+
+    assert os.path.exists(path)
+    assert manager.default_config["browser"] is not manager.config["browser"]
+
+def test_save_and_load(config_file):
+    manager = ConfigManager(config_file)
+
+    assert manager.save_config()
+    assert manager.load_config()
+
+def test_snapshot_is_cached(config_file):
+    manager = ConfigManager(config_file)
+
+    assert manager.get_browser_config() is manager.get_browser_config()
+
+def test_external_change_is_reloaded(config_file):
+    manager = ConfigManager(config_file, reload_interval=0)
+    assert manager.get_browser_config().implicit_wait != 7
+
+    other = ConfigManager(config_file)
+    other.update_config('browser', 'implicit_wait', 7)
+
+    assert manager.get_browser_config().implicit_wait == 7
+
+def test_unchanged_save_is_skipped(config_file):
+    manager = ConfigManager(config_file)
+    mtime = os.stat(config_file).st_mtime_ns
+
+    assert manager.save_config()
+    assert os.stat(config_file).st_mtime_ns == mtime
+
+def test_batch_update_writes_once(config_file):
+    manager = ConfigManager(config_file)
+    mtime = os.stat(config_file).st_mtime_ns
+
+    with manager.batch_update():
+        manager.update_config('browser', 'headless', True)
+        manager.update_config('browser', 'implicit_wait', 5)
+        assert os.stat(config_file).st_mtime_ns == mtime
+
+    reloaded = ConfigManager(config_file).get_browser_config()
+    assert reloaded.headless is True
+    assert reloaded.implicit_wait == 5
+    assert os.listdir(os.path.dirname(config_file)) == ['config.yaml']
+
+def test_batch_update_rolls_back_on_error(config_file):
+    manager = ConfigManager(config_file)
+    headless = manager.get_browser_config().headless
+
+    with pytest.raises(ValueError):
+        with manager.batch_update():
+            manager.update_config('browser', 'headless', not headless)
+            raise ValueError("rollback")
+
+    assert manager.config['browser']['headless'] is headless
+    assert manager.get_browser_config().headless is headless
+    assert ConfigManager(config_file).get_browser_config().headless is headless
+
+def test_rejected_update_leaves_config_untouched(config_file):
+    manager = ConfigManager(config_file)
+    timeout = manager.get_browser_config().page_load_timeout
+
+    assert not manager.update_config('browser', 'page_load_timeout', 'abc')
+    assert manager.config['browser']['page_load_timeout'] == timeout
+    assert ConfigManager(config_file).get_browser_config().page_load_timeout == timeout
+
+    # 被拒绝的值不会残留，之后的修改照常生效
+    assert manager.update_config('browser', 'implicit_wait', 5)
+    assert ConfigManager(config_file).get_browser_config().implicit_wait == 5
+
+def test_rejected_batch_discards_all_changes(config_file):
+    manager = ConfigManager(config_file)
+    before = copy.deepcopy(manager.config)
+    mtime = os.stat(config_file).st_mtime_ns
+
+    with manager.batch_update():
+        assert manager.update_config('browser', 'headless', not before['browser']['headless'])
+        assert not manager.update_config('browser', 'page_load_timeout', 'abc')
+
+    assert manager.config == before
+    assert manager.get_browser_config().headless is before['browser']['headless']
+    assert os.stat(config_file).st_mtime_ns == mtime
+
+def _write_faucet(config_file, **fields):
+    import yaml
+
+    with open(config_file, encoding='utf-8') as f:
+        data = yaml.safe_load(f)
+    data['faucets']['0g_testnet'].update(fields)
+    with open(config_file, 'w', encoding='utf-8') as f:
+        yaml.safe_dump(data, f, allow_unicode=True)
+    return data
+
+def test_fractional_cooldown_is_kept(config_file):
+    _write_faucet(config_file, cooldown_hours=1.5)
+
+    assert ConfigManager(config_file).get_faucet_config("0g_testnet").cooldown_hours == 1.5
+
+def test_null_values_are_not_stringified(config_file):
+    manager = ConfigManager(config_file)
+    with manager.batch_update():
+        manager.update_config('browser', 'user_agent', None)
+        manager.update_config('captcha', 'api_key', None)
+
+    assert manager.get_browser_config().user_agent == ""
+    assert manager.get_captcha_config().api_key == ""
+
+def test_invalid_field_falls_back_alone(config_file):
+    import yaml
+
+    data = _write_faucet(config_file, url="https://example.org/faucet")
+    data['proxy']['port'] = ''
+    with open(config_file, 'w', encoding='utf-8') as f:
+        yaml.safe_dump(data, f, allow_unicode=True)
+
+    manager = ConfigManager(config_file)
+
+    # 只有无效字段使用默认值，其余用户配置照常生效，并报告字段路径
+    assert manager.get_proxy_config().port == 0
+    assert manager.get_faucet_config("0g_testnet").url == "https://example.org/faucet"
+    assert len(manager.load_errors) == 1
+    assert "proxy.port" in manager.load_errors[0]
+
+def test_invalid_reload_keeps_current_config(config_file):
+    manager = ConfigManager(config_file, reload_interval=0)
+    port = manager.get_proxy_config().port
+
+    other = ConfigManager(config_file)
+    other.config['proxy']['port'] = 'abc'
+    other.save_config()
+
+    assert manager.get_proxy_config().port == port
+
+def test_bot_refuses_invalid_config(bot):
+    bot.config_manager.load_errors = ["proxy.port 应为整数，实际为 ''"]
+
+    assert "proxy.port 应为整数，实际为 ''" in bot._validate_config()
+
+def test_open_batch_does_not_block_other_threads(config_file):
+    import threading
+
+    manager = ConfigManager(config_file, reload_interval=0)
+    done = threading.Event()
+
+    def other_thread():
+        manager.snapshot()
+        manager.update_config('browser', 'page_load_timeout', 45)
+        done.set()
+
+    with pytest.raises(ValueError):
+        with manager.batch_update():
+            manager.update_config('browser', 'implicit_wait', 5)
+            worker = threading.Thread(target=other_thread)
+            worker.start()
+            assert done.wait(5), "批量更新期间其他线程被阻塞"
+            worker.join()
+            raise ValueError("rollback")
+
+    # 回滚只丢弃本线程暂存的修改
+    reloaded = ConfigManager(config_file).get_browser_config()
+    assert reloaded.page_load_timeout == 45
+    assert reloaded.implicit_wait != 5
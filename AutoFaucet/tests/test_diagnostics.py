@@ -0,0 +1,131 @@
+# -*- coding: utf-8 -*-
+"""运行诊断测试"""
+
+import os
+import signal
+import threading
+import time
+import tracemalloc
+
+import pytest
+
+from diagnostics import DiagnosticsHandler
+
+posix_only = pytest.mark.skipif(not hasattr(signal, 'SIGUSR1'), reason="需要SIGUSR1/SIGUSR2")
+
+@pytest.fixture
+def handler(tmp_path):
+    instance = DiagnosticsHandler(str(tmp_path / 'diagnostics'), top_n=5)
+    yield instance
+    instance.stop()
+    tracemalloc.stop()
+
+def _wait_for_files(directory, suffixes, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        names = os.listdir(directory) if os.path.isdir(directory) else []
+        found = {suffix: [n for n in names if n.endswith(suffix)] for suffix in suffixes}
+        if all(found.values()):
+            return found
+        time.sleep(0.01)
+    pytest.fail(f"诊断文件未生成: {suffixes}")
+
+def test_not_tracing_until_triggered(handler):
+    assert not tracemalloc.is_tracing()
+
+def test_capture_stacks_includes_other_threads(handler):
+    result = {}
+    worker = threading.Thread(target=lambda: result.update(stacks=handler.capture_stacks()), name="StackProbe")
+    worker.start()
+    worker.join()
+
+    assert "## MainThread" in result['stacks']
+    assert "test_capture_stacks_includes_other_threads" in result['stacks']
+    assert "## StackProbe" not in result['stacks']
+
+def test_memory_report_diff(handler):
+    assert "已开启内存分配跟踪" in handler.memory_report()
+
+    retained = [bytearray(1024) for _ in range(2000)]
+    report = handler.memory_report()
+
+    assert "Top 5" in report
+    assert "test_diagnostics.py" in report
+    del retained
+
+@posix_only
+def test_signal_writes_reports(handler):
+    assert handler.install()
+    os.kill(os.getpid(), signal.SIGUSR1)
+    found = _wait_for_files(handler.output_dir, ('stacks.txt', 'memory.txt'))
+
+    with open(os.path.join(handler.output_dir, found['stacks.txt'][0]), encoding='utf-8') as f:
+        stacks = f.read()
+    # 调用栈由后台线程采集，信号处理器本身不做任何工作
+    assert "test_signal_writes_reports" in stacks
+    assert "## Diagnostics" not in stacks
+
+@posix_only
+def test_signal_handler_only_writes_to_pipe(handler, monkeypatch):
+    from logger import logger
+
+    def fail(*args, **kwargs):
+        raise AssertionError("信号处理器中不应记录日志或创建线程")
+    monkeypatch.setattr(logger, '信息', fail)
+    monkeypatch.setattr(threading.Thread, 'start', fail)
+    handler._write_fd = os.pipe()[1]
+
+    handler._signal_handler(signal.SIGUSR1, None)
+    handler._trace_off_handler(signal.SIGUSR2, None)
+    os.close(handler._write_fd)
+    handler._write_fd = None
+    handler._signal_handler(signal.SIGUSR1, None)  # 已关闭时忽略
+
+@posix_only
+def test_off_signal_stops_tracing(handler):
+    assert handler.install()
+    os.kill(os.getpid(), signal.SIGUSR1)
+    _wait_for_files(handler.output_dir, ('memory.txt',))
+
+    os.kill(os.getpid(), signal.SIGUSR2)
+    deadline = time.monotonic() + 5.0
+    while tracemalloc.is_tracing() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert not tracemalloc.is_tracing()
+
+@posix_only
+def test_stop_restores_signal_handlers(tmp_path):
+    previous = signal.getsignal(signal.SIGUSR1)
+    instance = DiagnosticsHandler(str(tmp_path))
+    assert instance.install()
+    instance.stop()
+
+    assert signal.getsignal(signal.SIGUSR1) == previous
+    assert not any(thread.name == "Diagnostics" for thread in threading.enumerate())
+
+def _busy_work():
+    return sum(range(1000))
+
+def test_sampling_profile_covers_other_threads(handler):
+    stop = threading.Event()
+
+    def busy():
+        while not stop.is_set():
+            _busy_work()
+
+    worker = threading.Thread(target=busy, name="BusyProbe")
+    worker.start()
+    try:
+        report, collapsed = handler.sample_profile(0.2)
+    finally:
+        stop.set()
+        worker.join()
+
+    assert "_busy_work" in report
+    assert any(line.startswith("BusyProbe;") for line in collapsed.splitlines())
+
+@posix_only
+def test_bot_installs_diagnostics(bot, tmp_path):
+    assert bot.diagnostics is not None
+    assert signal.getsignal(signal.SIGUSR1) == bot.diagnostics._signal_handler
+    assert bot.diagnostics.output_dir == os.path.join(bot.logs_dir, 'diagnostics')
@@ -0,0 +1,133 @@
+# -*- coding: utf-8 -*-
+"""增量导出测试"""
+
+import csv
+import json
+import os
+
+import pytest
+
+from exporter import ColumnarExporter, STATE_FILE
+from record_store import SuccessRecordStore
+from run_stats import RunStats
+
+@pytest.fixture
+def store(tmp_path):
+    instance = SuccessRecordStore(str(tmp_path / 'records.db'))
+    yield instance
+    instance.close()
+
+def add_records(store, start, count):
+    for i in range(start, start + count):
+        store.append({'timestamp': f'2025-01-01T00:00:{i:02d}', 'tx_hash': f'0x{i}', 'amount': '0.1'})
+
+def read_csv(path):
+    with open(path, encoding='utf-8', newline='') as f:
+        return list(csv.DictReader(f))
+
+def test_csv_export_appends_only_new_rows(tmp_path, store):
+    export_dir = str(tmp_path / 'export')
+    add_records(store, 0, 3)
+
+    assert ColumnarExporter(export_dir, 'csv').export(store) == {'success_records': 3}
+    assert ColumnarExporter(export_dir, 'csv').export(store) == {'success_records': 0}
+
+    add_records(store, 3, 2)
+    assert ColumnarExporter(export_dir, 'csv').export(store) == {'success_records': 2}
+
+    rows = read_csv(os.path.join(export_dir, 'success_records.csv'))
+    assert [row['tx_hash'] for row in rows] == [f'0x{i}' for i in range(5)]
+    assert [int(row['id']) for row in rows] == [1, 2, 3, 4, 5]
+
+    with open(os.path.join(export_dir, STATE_FILE), encoding='utf-8') as f:
+        state = json.load(f)
+    assert state['format'] == 'csv'
+    assert state['tables']['success_records']['watermark'] == 5
+
+    with open(os.path.join(export_dir, 'success_records.schema.json'), encoding='utf-8') as f:
+        schema = json.load(f)
+    assert {'name': 'id', 'type': 'int64'} in schema['columns']
+
+def test_only_finished_stats_buckets_are_exported(tmp_path, store):
+    export_dir = str(tmp_path / 'export')
+    stats = RunStats(bucket_seconds=60)
+    now = 1_000_000 * 60 + 30
+    for offset in (-180, -120, 0):
+        stats.record_attempt(True, 2.0, timestamp=now + offset)
+
+    exporter = ColumnarExporter(export_dir, 'csv')
+    assert exporter.export(store, stats, now=now)['run_stats'] == 2
+    # 当前时间桶结束后才导出，已导出的桶不再重复
+    assert exporter.export(store, stats, now=now)['run_stats'] == 0
+    assert exporter.export(store, stats, now=now + 60)['run_stats'] == 1
+
+    rows = read_csv(os.path.join(export_dir, 'run_stats.csv'))
+    assert len(rows) == 3
+    assert all(row['attempts'] == '1' and row['bucket_seconds'] == '60' for row in rows)
+
+def test_partial_write_is_truncated_before_next_export(tmp_path, store):
+    export_dir = str(tmp_path / 'export')
+    add_records(store, 0, 2)
+    ColumnarExporter(export_dir, 'csv').export(store)
+
+    # 模拟写入后、记录水位前中断：文件末尾多出未确认的行
+    csv_path = os.path.join(export_dir, 'success_records.csv')
+    with open(csv_path, 'a', encoding='utf-8', newline='') as f:
+        f.write('3,2025-01-01T00:00:02,0x2,0.1,,,\n')
+
+    add_records(store, 2, 1)
+    assert ColumnarExporter(export_dir, 'csv').export(store) == {'success_records': 1}
+    assert [row['tx_hash'] for row in read_csv(csv_path)] == ['0x0', '0x1', '0x2']
+
+def test_deleted_output_is_exported_again(tmp_path, store):
+    export_dir = str(tmp_path / 'export')
+    add_records(store, 0, 2)
+    ColumnarExporter(export_dir, 'csv').export(store)
+
+    os.remove(os.path.join(export_dir, 'success_records.csv'))
+    assert ColumnarExporter(export_dir, 'csv').export(store) == {'success_records': 2}
+
+def test_format_mismatch_is_rejected(tmp_path, store):
+    export_dir = str(tmp_path / 'export')
+    add_records(store, 0, 1)
+    ColumnarExporter(export_dir, 'csv').export(store)
+
+    with open(os.path.join(export_dir, STATE_FILE), encoding='utf-8') as f:
+        state = json.load(f)
+    state['format'] = 'parquet'
+    with open(os.path.join(export_dir, STATE_FILE), 'w', encoding='utf-8') as f:
+        json.dump(state, f)
+
+    with pytest.raises(ValueError):
+        ColumnarExporter(export_dir, 'csv').export(store)
+
+def test_unknown_format_is_rejected(tmp_path):
+    with pytest.raises(ValueError):
+        ColumnarExporter(str(tmp_path), 'xlsx')
+
+def test_parquet_export_writes_parts(tmp_path, store):
+    pq = pytest.importorskip('pyarrow.parquet')
+    export_dir = str(tmp_path / 'export')
+    add_records(store, 0, 3)
+    ColumnarExporter(export_dir, 'parquet').export(store)
+    add_records(store, 3, 2)
+    ColumnarExporter(export_dir, 'parquet').export(store)
+
+    table_dir = os.path.join(export_dir, 'success_records')
+    assert sorted(os.listdir(table_dir)) == ['part-000000000001.parquet', 'part-000000000004.parquet']
+    table = pq.read_table(table_dir)
+    assert table.num_rows == 5
+    assert str(table.schema.field('id').type) == 'int64'
+
+def test_export_history_cli(tmp_path, capsys):
+    from main import export_history
+
+    log_dir = str(tmp_path / 'logs')
+    os.makedirs(log_dir)
+    store = SuccessRecordStore(os.path.join(log_dir, 'success_records.db'))
+    add_records(store, 0, 2)
+    store.close()
+
+    assert export_history(log_dir, fmt='csv')
+    assert 'success_records: 新增 2 行' in capsys.readouterr().out
+    assert os.path.exists(os.path.join(log_dir, 'export', 'success_records.csv'))
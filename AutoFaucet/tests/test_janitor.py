@@ -0,0 +1,81 @@
+# -*- coding: utf-8 -*-
+"""后台清理测试"""
+
+import gzip
+import os
+import time
+
+from janitor import BackgroundJanitor, RetentionRule, build_rules
+
+LINE = "2025-08-03 03:53:01 - AutoFaucet - INFO - 测试\n"
+
+def _write(path, text, age_hours=0):
+    path.write_text(text, encoding='utf-8')
+    if age_hours:
+        mtime = time.time() - age_hours * 3600
+        os.utime(path, (mtime, mtime))
+
+def test_compresses_rotated_and_deletes_expired(tmp_path):
+    active = tmp_path / 'AutoFaucet_20250803.log'
+    rotated = tmp_path / 'AutoFaucet_20250803.log.1'
+    expired = tmp_path / 'AutoFaucet_20250701.log.2'
+    for path in (active, rotated):
+        _write(path, LINE * 100)
+    _write(expired, LINE * 100, age_hours=40 * 24)
+
+    janitor = BackgroundJanitor(
+        [RetentionRule(str(tmp_path), "AutoFaucet_*.log*", max_age_hours=30 * 24, compress=True)],
+        active_files=[str(active)]
+    )
+    result = janitor.run_once()
+
+    remaining = sorted(os.listdir(tmp_path))
+    assert result['compressed'] == 2
+    assert result['deleted'] == 1
+    assert remaining[0] == active.name
+    assert remaining[1].startswith('AutoFaucet_20250803.log.1.') and remaining[1].endswith('.gz')
+    with gzip.open(tmp_path / remaining[1], 'rt', encoding='utf-8') as f:
+        assert f.read() == LINE * 100
+
+def test_total_size_limit_deletes_oldest_first(tmp_path):
+    for i in range(5):
+        _write(tmp_path / f'shot_{i}.png', 'x' * 400 * 1024, age_hours=5 - i)
+
+    janitor = BackgroundJanitor([RetentionRule(str(tmp_path), "*.png", max_total_mb=1)])
+    result = janitor.run_once()
+
+    assert result['deleted'] == 3
+    assert sorted(os.listdir(tmp_path)) == ['shot_3.png', 'shot_4.png']
+
+def test_background_thread_stops(tmp_path):
+    _write(tmp_path / 'captcha_1.png', 'x', age_hours=48)
+    janitor = BackgroundJanitor([RetentionRule(str(tmp_path), "captcha_*", max_age_hours=24)], interval_seconds=60)
+
+    janitor.start()
+    deadline = time.monotonic() + 2
+    while os.listdir(tmp_path) and time.monotonic() < deadline:
+        time.sleep(0.01)
+    janitor.stop(timeout=2)
+
+    assert os.listdir(tmp_path) == []
+
+def test_build_rules_from_config(tmp_path):
+    rules = build_rules({'log_max_age_days': 2, 'compress_logs': False}, str(tmp_path))
+
+    assert rules[0].directory == str(tmp_path)
+    assert rules[0].max_age_hours == 48
+    assert not rules[0].compress
+
+def test_recently_written_logs_are_left_alone(tmp_path):
+    # 其他进程正在写入的当日日志：不在本进程的active_files中，但最近有修改
+    shared = tmp_path / 'AutoFaucet_20250804.log'
+    idle = tmp_path / 'AutoFaucet_20250803.log'
+    _write(shared, LINE * 100)
+    _write(idle, LINE * 100, age_hours=2)
+
+    rules = build_rules({'log_max_total_mb': 0.001, 'log_min_idle_minutes': 60}, str(tmp_path))
+    result = BackgroundJanitor(rules[:1]).run_once()
+
+    assert shared.read_text(encoding='utf-8') == LINE * 100
+    assert not idle.exists()
+    assert result['compressed'] == 1
@@ -0,0 +1,143 @@
+# -*- coding: utf-8 -*-
+"""日志与日志分析测试"""
+
+import gzip
+import logging
+import time
+
+import pytest
+
+from logger import logger, ChineseLogger, BatchingRotatingFileHandler
+from log_analyzer import find_log_files, analyze_logs, normalize_error
+
+LOG_LINES = (
+    "2025-08-03 03:53:01 - AutoFaucet - INFO - ℹ️ 开始测试\n"
+    "2025-08-03 03:53:02 - AutoFaucet - ERROR - ❌ 领取失败: 超时 30 秒\n"
+    "Traceback (most recent call last):\n"
+    "2025-08-03 04:10:00 - AutoFaucet - ERROR - ❌ 领取失败: 超时 45 秒\n"
+)
+
+@pytest.fixture
+def file_logger(tmp_path, request):
+    """写入临时目录的独立日志实例"""
+    instance = ChineseLogger(name=f"test_{request.node.name}", log_file=str(tmp_path / 'test.log'))
+    yield instance
+    instance.close()
+    instance.logger.handlers.clear()
+
+def test_chinese_helpers(caplog):
+    caplog.set_level(logging.DEBUG, logger=logger.name)
+
+    logger.调试("这是调试信息")
+    logger.成功("这是成功信息")
+    logger.开始操作("测试操作")
+    logger.完成操作("测试操作")
+    logger.步骤("执行测试步骤")
+    logger.等待("等待测试完成")
+    logger.点击("测试按钮")
+    logger.输入("测试输入框", "测试内容")
+    logger.钱包("地址", "0x742d35Cc6634C0532925a3b8D4C9db96C4b4d8b9")
+
+    messages = [record.getMessage() for record in caplog.records]
+    assert len(messages) == 9
+    assert messages[-1] == "💰 钱包地址: 0x742d...d8b9"
+
+def test_disabled_level_skips_formatting(file_logger):
+    class Unformattable:
+        def __str__(self):
+            raise AssertionError("级别关闭时不应格式化参数")
+
+    file_logger.logger.setLevel(logging.WARNING)
+
+    assert not file_logger.is_enabled(logging.INFO)
+    file_logger.信息("%s", Unformattable())
+    file_logger.输入("输入框", Unformattable())
+
+def test_async_writer_flushes_on_close(file_logger, tmp_path):
+    for i in range(500):
+        file_logger.info("记录 %d", i)
+    file_logger.close()
+
+    lines = (tmp_path / 'test.log').read_text(encoding='utf-8').splitlines()
+    assert len(lines) == 500
+    assert lines[-1].endswith("记录 499")
+
+def test_async_writer_flushes_errors_immediately(file_logger, tmp_path):
+    file_logger.error("立即落盘")
+
+    deadline = time.monotonic() + 0.5
+    path = tmp_path / 'test.log'
+    while time.monotonic() < deadline:
+        if path.exists() and "立即落盘" in path.read_text(encoding='utf-8'):
+            break
+        time.sleep(0.01)
+    else:
+        pytest.fail("错误日志未立即落盘")
+
+def test_write_batch_rotates(tmp_path):
+    path = tmp_path / 'rotate.log'
+    handler = BatchingRotatingFileHandler(str(path), maxBytes=1000, backupCount=3, encoding='utf-8', delay=True)
+    handler.setFormatter(logging.Formatter("%(message)s"))
+    records = [
+        logging.LogRecord("test", logging.INFO, __file__, 0, "x" * 99, None, None)
+        for _ in range(25)
+    ]
+
+    handler.write_batch(records)
+    handler.close()
+
+    sizes = [p.stat().st_size for p in sorted(tmp_path.iterdir())]
+    assert len(sizes) == 3
+    assert all(size < 1000 for size in sizes)
+    assert sum(sizes) == 25 * 100
+
+def test_normalize_error():
+    assert normalize_error("❌ 交易 0xABCdef 失败, 重试 3 次") == "交易 0x# 失败, 重试 # 次"
+
+@pytest.mark.parametrize("jobs", [1, 2])
+def test_analyze_plain_and_gzip_logs(tmp_path, jobs):
+    (tmp_path / 'AutoFaucet_20250803.log').write_text(LOG_LINES, encoding='utf-8')
+    with gzip.open(tmp_path / 'AutoFaucet_20250803.log.1.gz', 'wt', encoding='utf-8') as f:
+        f.write(LOG_LINES)
+    (tmp_path / 'other.log').write_text(LOG_LINES, encoding='utf-8')
+
+    summary = analyze_logs(find_log_files(str(tmp_path)), jobs=jobs)
+
+    assert summary.files == 2
+    assert summary.records == 6
+    assert summary.continuation_lines == 2
+    assert summary.levels['ERROR'] == 4
+    assert summary.hours['04'] == 2
+    assert summary.errors['领取失败: 超时 # 秒'] == 4
+    assert (summary.first_time, summary.last_time) == ("2025-08-03 03:53:01", "2025-08-03 04:10:00")
+
+def test_queue_overflow_drops_and_reports(tmp_path):
+    import queue
+    from logger import AsyncLogWriter, BoundedQueueHandler
+
+    path = tmp_path / 'overflow.log'
+    handler = BatchingRotatingFileHandler(str(path), encoding='utf-8', delay=True)
+    handler.setFormatter(logging.Formatter("%(levelname)s %(message)s"))
+    log_queue = queue.SimpleQueue()
+    queue_handler = BoundedQueueHandler(log_queue, max_pending=10)
+    overflow = logging.getLogger("test_overflow")
+    overflow.setLevel(logging.INFO)
+    overflow.propagate = False
+    overflow.addHandler(queue_handler)
+
+    # 写入线程未启动，模拟磁盘阻塞时的积压
+    for i in range(15):
+        overflow.info("记录 %d", i)
+    overflow.error("错误日志不丢弃")
+    overflow.removeHandler(queue_handler)
+
+    assert queue_handler.dropped == 5
+    writer = AsyncLogWriter(log_queue, handler, source=queue_handler)
+    writer.start()
+    writer.stop()
+    handler.close()
+
+    lines = path.read_text(encoding='utf-8').splitlines()
+    assert len(lines) == 12
+    assert lines[10] == "ERROR 错误日志不丢弃"
+    assert "已丢弃 5 条日志" in lines[-1]
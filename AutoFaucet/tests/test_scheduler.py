@@ -0,0 +1,67 @@
+# -*- coding: utf-8 -*-
+"""领取调度器测试"""
+
+import os
+import signal
+import threading
+import time
+
+import pytest
+
+from scheduler import ClaimScheduler
+
+@pytest.fixture
+def scheduler(tmp_path):
+    instance = ClaimScheduler(str(tmp_path / 'schedule_state.json'), progress_interval=0.05)
+    yield instance
+    instance.close()
+
+def test_next_run_is_persisted(scheduler, tmp_path):
+    next_run = scheduler.schedule_next(3600)
+    reloaded = ClaimScheduler(str(tmp_path / 'schedule_state.json'))
+
+    assert abs(reloaded.load_next_run() - next_run) < 1e-3
+    reloaded.close()
+
+def test_missing_or_corrupt_state(scheduler, tmp_path):
+    assert scheduler.load_next_run() is None
+
+    (tmp_path / 'schedule_state.json').write_text('{"next_run": "soon"}', encoding='utf-8')
+    assert scheduler.load_next_run() is None
+
+def test_wait_returns_at_deadline(scheduler):
+    start = time.monotonic()
+
+    assert scheduler.wait_until(time.time() + 0.2)
+    assert 0.15 <= time.monotonic() - start < 2
+
+def test_past_deadline_returns_immediately(scheduler):
+    assert scheduler.wait_until(time.time() - 1)
+
+def test_stop_wakes_waiter(scheduler):
+    timer = threading.Timer(0.1, scheduler.stop)
+    timer.start()
+    start = time.monotonic()
+
+    assert not scheduler.wait_until(time.time() + 30)
+    assert time.monotonic() - start < 5
+    assert scheduler.stopped
+
+def test_stop_from_signal_handler_wakes_waiter(scheduler):
+    # stop()只写唤醒套接字，不获取被打断的主线程可能持有的锁
+    previous = signal.signal(signal.SIGINT, lambda signum, frame: scheduler.stop())
+    try:
+        threading.Timer(0.1, os.kill, (os.getpid(), signal.SIGINT)).start()
+        start = time.monotonic()
+
+        assert not scheduler.wait_until(time.time() + 30)
+        assert time.monotonic() - start < 5
+    finally:
+        signal.signal(signal.SIGINT, previous)
+
+def test_stop_after_close_is_ignored(scheduler):
+    scheduler.close()
+    scheduler.stop()
+
+    assert scheduler.stopped
+    assert not scheduler.wait_until(time.time() + 30)
@@ -0,0 +1,121 @@
+# -*- coding: utf-8 -*-
+"""成功记录存储与运行统计测试"""
+
+import json
+import os
+import time
+
+import pytest
+
+from record_store import SuccessRecordStore
+from run_stats import RunStats
+from utils import file_utils
+
+@pytest.fixture
+def store(tmp_path):
+    instance = SuccessRecordStore(str(tmp_path / 'records.db'))
+    yield instance
+    instance.close()
+
+def test_migrates_legacy_json(tmp_path):
+    legacy_file = str(tmp_path / 'success_records.json')
+    file_utils.save_json([
+        {'timestamp': '2025-01-01T00:00:00', 'tx_hash': '0xaaa'},
+        {'timestamp': '2025-01-02T00:00:00', 'tx_hash': '0xbbb'}
+    ], legacy_file)
+
+    store = SuccessRecordStore(str(tmp_path / 'records.db'), legacy_file)
+    try:
+        assert not os.path.exists(legacy_file)
+        assert store.count() == 2
+    finally:
+        store.close()
+
+def test_migration_skips_bad_rows(tmp_path):
+    legacy_file = str(tmp_path / 'success_records.json')
+    file_utils.save_json([
+        {'timestamp': '2025-01-01T00:00:00', 'tx_hash': '0xaaa', 'amount': {'value': 1, 'unit': 'A0GI'}},
+        {'timestamp': '2025-01-02T00:00:00', 'tx_hash': '0xbbb', 'amount': 10 ** 30},
+        {'tx_hash': '0xccc'},
+        {'timestamp': '2025-01-03T00:00:00', 'tx_hash': '0xddd', 'note': '旧字段'}
+    ], legacy_file)
+
+    store = SuccessRecordStore(str(tmp_path / 'records.db'), legacy_file)
+    try:
+        # 非标量值序列化为JSON保存，无法导入的记录跳过，其余照常迁移
+        assert [r['tx_hash'] for r in store.iter_records()] == ['0xaaa', '0xddd']
+        assert json.loads(next(store.iter_records())['amount']) == {'value': 1, 'unit': 'A0GI'}
+        assert not os.path.exists(legacy_file)
+        assert os.path.exists(legacy_file + '.migrated')
+    finally:
+        store.close()
+
+def test_reappeared_legacy_file_keeps_backup(tmp_path):
+    legacy_file = str(tmp_path / 'success_records.json')
+    db_path = str(tmp_path / 'records.db')
+    file_utils.save_json([{'timestamp': '2025-01-01T00:00:00', 'tx_hash': '0xaaa'}], legacy_file)
+    SuccessRecordStore(db_path, legacy_file).close()
+
+    file_utils.save_json([{'timestamp': '2025-02-01T00:00:00', 'tx_hash': '0xbbb'}], legacy_file)
+    store = SuccessRecordStore(db_path, legacy_file)
+    try:
+        assert store.count() == 1
+        assert file_utils.load_json(legacy_file + '.migrated')[0]['tx_hash'] == '0xaaa'
+        assert file_utils.load_json(legacy_file + '.migrated.1')[0]['tx_hash'] == '0xbbb'
+    finally:
+        store.close()
+
+def test_append_serializes_non_scalar_values(store):
+    assert store.append({'timestamp': '2025-01-01T00:00:00', 'amount': [1, 2]})
+    assert json.loads(store.latest()['amount']) == [1, 2]
+
+def test_append_and_query_by_time(store):
+    for day in (1, 2, 3):
+        store.append({'timestamp': f'2025-01-0{day}T00:00:00', 'tx_hash': f'0x{day}'})
+
+    assert [r['tx_hash'] for r in store.iter_records(since='2025-01-02')] == ['0x2', '0x3']
+    assert [r['tx_hash'] for r in store.iter_records(until='2025-01-02')] == ['0x1']
+    assert store.count(since='2025-01-03') == 1
+    assert store.latest()['tx_hash'] == '0x3'
+
+def test_iter_records_in_batches(store):
+    for i in range(25):
+        store.append({'timestamp': f'2025-01-01T00:00:{i:02d}', 'tx_hash': f'0x{i}'})
+
+    assert [r['tx_hash'] for r in store.iter_records(batch_size=10)] == [f'0x{i}' for i in range(25)]
+
+def test_rolling_windows():
+    stats = RunStats()
+    now = time.time()
+
+    # 每小时一次，共10天，超出7天的部分不应计入滚动窗口
+    for i in range(240):
+        stats.record_attempt(i % 2 == 0, 30.0, timestamp=now - i * 3600)
+
+    rolling = stats.rolling(now)
+    assert rolling['1小时']['attempts'] == 1
+    assert rolling['24小时']['attempts'] == 24
+    assert rolling['7天']['attempts'] == 168
+    assert rolling['7天']['success_rate'] == 50.0
+    assert rolling['7天']['avg_duration'] == 30.0
+    assert stats.total_attempts == 240
+
+def test_checkpoint_and_restore(tmp_path):
+    state_file = str(tmp_path / 'run_stats.json')
+    stats = RunStats(state_file)
+    now = time.time()
+    for i in range(48):
+        stats.record_attempt(i % 3 != 0, 12.5, captcha_failed=i % 3 == 0, timestamp=now - i * 1800)
+
+    assert stats.checkpoint()
+    restored = RunStats(state_file)
+
+    assert restored.to_dict() == stats.to_dict()
+    assert restored.rolling(now) == stats.rolling(now)
+
+def test_restore_ignores_corrupt_state(tmp_path):
+    state_file = tmp_path / 'run_stats.json'
+    state_file.write_text('{"total_attempts": "many"}', encoding='utf-8')
+
+    stats = RunStats(str(state_file))
+    assert stats.total_attempts == 0
@@ -0,0 +1,98 @@
+# -*- coding: utf-8 -*-
+"""工具模块测试"""
+
+import os
+import time
+
+import pytest
+
+from utils import network_utils, file_utils, time_utils, validation_utils
+
+def test_check_internet_connection_offline():
+    assert network_utils.check_internet_connection(timeout=1) is False
+
+def test_get_public_ip_skips_failed_services(fake_requests):
+    fake_requests.add("https://api.ipify.org", status_code=503)
+    fake_requests.add("https://ipinfo.io/ip", text="not-an-ip")
+    fake_requests.add("https://api.ip.sb/ip", text="198.51.100.4\n")
+
+    assert network_utils.get_public_ip() == "198.51.100.4"
+    assert [call['url'] for call in fake_requests.calls] == [
+        "https://api.ipify.org", "https://ipinfo.io/ip", "https://api.ip.sb/ip"
+    ]
+
+def test_get_public_ip_all_services_down(fake_requests):
+    assert network_utils.get_public_ip() is None
+    assert len(fake_requests.calls) == 4
+
+def test_proxy_check_uses_proxy(fake_requests):
+    fake_requests.add("http://httpbin.org/ip", json_data={'origin': '198.51.100.4'})
+
+    assert network_utils.test_proxy("http://127.0.0.1:8080") is True
+    assert fake_requests.calls[0]['proxies'] == {
+        'http': "http://127.0.0.1:8080", 'https': "http://127.0.0.1:8080"
+    }
+
+@pytest.mark.parametrize("url, expected", [
+    ("https://www.google.com", True),
+    ("invalid-url", False),
+    ("http://example.com", True),
+    ("not-a-url", False),
+])
+def test_validate_url(url, expected):
+    assert validation_utils.validate_url(url) is expected
+
+@pytest.mark.parametrize("address, expected", [
+    ("0x742d35Cc6634C0532925a3b8D4C9db96C4b4d8b", False),  # 长度不对
+    ("0x742d35Cc6634C0532925a3b8D4C9db96C4b4d8b9", True),  # 正确格式
+    ("742d35Cc6634C0532925a3b8D4C9db96C4b4d8b9", False),  # 缺少0x
+    ("0xGGGd35Cc6634C0532925a3b8D4C9db96C4b4d8b9", False),  # 非十六进制
+])
+def test_is_valid_ethereum_address(address, expected):
+    assert validation_utils.is_valid_ethereum_address(address) is expected
+
+@pytest.mark.parametrize("proxy, expected", [
+    ("127.0.0.1:8080", True),
+    ("http://127.0.0.1:8080", True),
+    ("socks5://127.0.0.1:1080", True),
+    ("invalid-proxy", False),
+    ("127.0.0.1", False),  # 缺少端口
+])
+def test_validate_proxy_format(proxy, expected):
+    assert validation_utils.validate_proxy_format(proxy) is expected
+
+def test_json_round_trip(tmp_path):
+    data = {'test': True, 'number': 123, 'array': [1, 2, 3], 'chinese': '测试中文'}
+    path = str(tmp_path / 'nested' / 'test.json')
+
+    assert file_utils.save_json(data, path)
+    assert file_utils.load_json(path) == data
+    assert file_utils.delete_file(path)
+    assert file_utils.load_json(path) is None
+
+def test_atomic_write_text_replaces_file(tmp_path):
+    path = str(tmp_path / 'state.json')
+    file_utils.save_text("old", path)
+
+    assert file_utils.atomic_write_text("new", path)
+    assert file_utils.load_text(path) == "new"
+    assert os.listdir(tmp_path) == ['state.json']
+
+def test_cleanup_old_files(tmp_path):
+    old_time = time.time() - 48 * 3600
+    for name in ('old.png', 'new.png', 'old.txt', '.hidden.png'):
+        path = tmp_path / name
+        path.write_text(name)
+        if name != 'new.png':
+            os.utime(path, (old_time, old_time))
+
+    assert file_utils.cleanup_old_files(str(tmp_path), max_age_hours=24, pattern="*.png") == 1
+    assert sorted(os.listdir(tmp_path)) == ['.hidden.png', 'new.png', 'old.txt']
+
+@pytest.mark.parametrize("seconds, expected", [
+    (5, "5.0秒"),
+    (90, "1.5分钟"),
+    (5400, "1.5小时"),
+])
+def test_format_duration(seconds, expected):
+    assert time_utils.format_duration(seconds) == expected
@@ -9,12 +9,12 @@ import time
 import json
 import random
 import hashlib
-import requests
 import socket
 from datetime import datetime, timedelta
 from typing import Optional, Dict, List, Any, Union
 from urllib.parse import urlparse
 import subprocess
+import atomic_file
 from logger import logger
 
 class NetworkUtils:
@@ -39,6 +39,8 @@ class NetworkUtils:
     def get_public_ip() -> Optional[str]:
         """获取公网IP"""
         try:
+            import requests
+            
             # 尝试多个IP查询服务
             services = [
                 "https://api.ipify.org",
@@ -76,6 +78,8 @@ class NetworkUtils:
     def test_proxy(proxy: str, timeout: int = 10) -> bool:
         """测试代理可用性"""
         try:
+            import requests
+            
             proxies = {
                 'http': proxy,
                 'https': proxy
@@ -152,6 +156,21 @@ class FileUtils:
             logger.错误(f"加载JSON文件失败 {filepath}: {str(e)}")
             return None
     
+    @staticmethod
+    def atomic_write_text(text: str, filepath: str) -> bool:
+        """原子写入文本文件：先写临时文件并fsync，再重命名覆盖"""
+        try:
+            directory = os.path.dirname(filepath)
+            if directory:
+                FileUtils.ensure_dir(directory)
+            
+            atomic_file.atomic_write_text(text, filepath)
+            return True
+            
+        except Exception as e:
+            logger.错误(f"原子写入文件失败 {filepath}: {str(e)}")
+            return False
+    
     @staticmethod
     def save_text(text: str, filepath: str) -> bool:
         """保存文本文件"""
@@ -206,24 +225,28 @@ class FileUtils:
     def cleanup_old_files(directory: str, max_age_hours: int = 24, pattern: str = "*") -> int:
         """清理旧文件"""
         try:
-            import glob
+            import fnmatch
             
             if not os.path.exists(directory):
                 return 0
             
-            pattern_path = os.path.join(directory, pattern)
-            files = glob.glob(pattern_path)
-            
             cutoff_time = time.time() - (max_age_hours * 3600)
             deleted_count = 0
             
-            for file in files:
-                try:
-                    if os.path.getmtime(file) < cutoff_time:
-                        os.remove(file)
-                        deleted_count += 1
-                except:
-                    continue
+            # os.scandir 边遍历边处理，不必先用glob构造完整的文件列表
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    try:
+                        # 与glob一致，通配符不匹配隐藏文件
+                        if entry.name.startswith('.') and not pattern.startswith('.'):
+                            continue
+                        if not fnmatch.fnmatch(entry.name, pattern):
+                            continue
+                        if entry.stat().st_mtime < cutoff_time:
+                            os.remove(entry.path)
+                            deleted_count += 1
+                    except OSError:
+                        continue
             
             return deleted_count
             